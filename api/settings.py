@@ -76,6 +76,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.CompressedResponseCacheMiddleware",
 ]
 
 ROOT_URLCONF = "api.urls"
@@ -136,6 +137,7 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
     "ROTATE_REFRESH_TOKENS": os.getenv("JWT_ROTATE_REFRESH_TOKENS", "1") == "1",
     "BLACKLIST_AFTER_ROTATION": os.getenv("JWT_BLACKLIST_AFTER_ROTATION", "1") == "1",
+    "TOKEN_OBTAIN_SERIALIZER": "core.serializers.LanguageTokenObtainPairSerializer",
 }
 
 # -------- Static
@@ -176,6 +178,9 @@ LANGUAGES = [
 
 MODELTRANSLATION_DEFAULT_LANGUAGE = 'en'
 
+# Listing working hours and event times are entered in local time
+LOCAL_TIME_ZONE = os.getenv("LOCAL_TIME_ZONE", "Europe/Skopje")
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # -------- Admin Security
@@ -309,6 +314,9 @@ CACHES = {
     }
 }
 
+# Anonymous content responses are cached compressed for this long (0 disables)
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', '60'))
+
 # -------- Session Configuration
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache' if os.getenv('REDIS_URL') else 'django.contrib.sessions.backends.db'
 SESSION_CACHE_ALIAS = 'default'
@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from rest_framework.routers import DefaultRouter
-from core.views import ItemViewSet, CategoryViewSet, ListingViewSet, EventViewSet, PromotionViewSet, BlogViewSet, WishlistViewSet, UserPermissionViewSet, health, Register, Me, LanguageView, EditListingView, AdminUsersView, CreateGuestAccount, GuestLanguageView
+from core.views import ItemViewSet, CategoryViewSet, ListingViewSet, EventViewSet, PromotionViewSet, BlogViewSet, WishlistViewSet, UserPermissionViewSet, health, Register, Me, LanguageView, EditListingView, AdminUsersView, CreateGuestAccount, GuestLanguageView, HomeFeedView, TagCountsView, SyncView, SearchView, FuzzySearchView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 router = DefaultRouter()
@@ -17,6 +17,11 @@ router.register(r"admin/permissions", UserPermissionViewSet, basename="permissio
 
 urlpatterns = [
     path('api/', include(router.urls)),
+    path("api/home/", HomeFeedView.as_view(), name="home_feed"),
+    path("api/sync/", SyncView.as_view(), name="sync"),
+    path("api/tags/", TagCountsView.as_view(), name="tag_counts"),
+    path("api/search/", SearchView.as_view(), name="search"),
+    path("api/search/fuzzy/", FuzzySearchView.as_view(), name="fuzzy_search"),
     path("api/auth/register/", Register.as_view()),
     path("api/auth/guest/", CreateGuestAccount.as_view(), name="create_guest"),
     path("api/auth/me/", Me.as_view()),
@@ -77,10 +77,11 @@ class ItemAdmin(admin.ModelAdmin):
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ('name', 'icon', 'trending', 'created_at')
+    list_display = ('name', 'icon', 'trending', 'trending_score', 'created_at')
     list_filter = ('trending', 'created_at')
     search_fields = ('name', 'icon')
-    list_editable = ('trending',)
+    # Maintained by compute_trending; manual edits would be overwritten
+    readonly_fields = ('trending', 'trending_score')
     ordering = ('name',)
 
 @admin.register(Listing)
@@ -93,7 +94,7 @@ class ListingAdmin(MultilingualAdminMixin, admin.ModelAdmin):
     
     fieldsets = (
         ('Basic Information', {
-            'fields': ('category', 'featured', 'image', 'phone_number', 'website_url', 'facebook_url', 'instagram_url'),
+            'fields': ('category', 'featured', 'image', 'phone_number', 'website_url', 'facebook_url', 'instagram_url', 'latitude', 'longitude'),
             'classes': ('wide',),
         }),
         ('English Content', {
@@ -114,7 +115,7 @@ class ListingAdmin(MultilingualAdminMixin, admin.ModelAdmin):
 
 @admin.register(Event)
 class EventAdmin(MultilingualAdminMixin, admin.ModelAdmin):
-    list_display = ('title', 'date_time', 'location', 'category', 'featured', 'join_count', 'created_at')
+    list_display = ('title', 'date_time', 'starts_at', 'location', 'category', 'featured', 'join_count', 'created_at')
     list_filter = ('category', 'featured', 'created_at')
     search_fields = ('title', 'location', 'description', 'category')
     list_editable = ('featured',)
@@ -122,7 +123,7 @@ class EventAdmin(MultilingualAdminMixin, admin.ModelAdmin):
     
     fieldsets = (
         ('Basic Information', {
-            'fields': ('category', 'featured', 'date_time', 'cover_image', 'join_count'),
+            'fields': ('category', 'featured', 'date_time', 'starts_at', 'ends_at', 'cover_image', 'join_count', 'latitude', 'longitude'),
             'classes': ('wide',),
         }),
         ('English Content', {
@@ -151,7 +152,7 @@ class PromotionAdmin(MultilingualAdminMixin, admin.ModelAdmin):
     
     fieldsets = (
         ('Basic Information', {
-            'fields': ('featured', 'image', 'valid_until', 'has_discount_code', 'discount_code', 'website', 'phone_number', 'facebook_url', 'instagram_url', 'address'),
+            'fields': ('featured', 'image', 'valid_until', 'has_discount_code', 'discount_code', 'website', 'phone_number', 'facebook_url', 'instagram_url', 'address', 'latitude', 'longitude'),
             'classes': ('wide',),
         }),
         ('English Content', {
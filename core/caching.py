@@ -0,0 +1,37 @@
+"""
+Cache helpers for derived API payloads.
+
+Cached payloads embed a global content version in their keys; every content or
+category change bumps the version so stale entries are simply never read again.
+"""
+import math
+import time
+
+from django.core.cache import cache
+
+CONTENT_VERSION_KEY = 'content:version'
+
+
+def content_version():
+    """Return the current content version, initialising it after a cache flush."""
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        cache.add(CONTENT_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(CONTENT_VERSION_KEY)
+    return version
+
+
+def bump_content_version():
+    cache.set(CONTENT_VERSION_KEY, time.time_ns(), None)
+
+
+def content_cache_key(*parts):
+    """Build a cache key that is invalidated by the next content change."""
+    return ':'.join(str(part) for part in (*parts, content_version()))
+
+
+def timeout_until(moment, default, now):
+    """Cache timeout that expires a payload when ``moment`` (e.g. the next event start) passes."""
+    if moment is None:
+        return default
+    return max(1, min(default, math.ceil((moment - now).total_seconds())))
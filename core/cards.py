@@ -0,0 +1,54 @@
+"""
+Materialized per-language API payloads ("cards") for the public content models.
+
+Cards are rendered on the write path and stored in each row's ``card_cache`` so
+list endpoints can serve them without re-running the translation getters.
+Per-user fields are left out and merged in at request time. Cards record the
+``CARD_VERSION`` they were rendered with; cards from an older version are ignored
+(lists serialize those rows live) until ``reindex_content`` rebuilds them.
+"""
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Listing, Event, Promotion, Blog
+from .serializers import CARD_VERSION, ListingSerializer, EventSerializer, PromotionSerializer, BlogSummarySerializer
+
+CARD_SERIALIZERS = {
+    Listing: ListingSerializer,
+    Event: EventSerializer,
+    Promotion: PromotionSerializer,
+    Blog: BlogSummarySerializer,
+}
+
+
+def build_cards(instance):
+    """Render the card for every configured language."""
+    serializer_class = CARD_SERIALIZERS[type(instance)]
+    cards = {'version': CARD_VERSION}
+    for language, _name in settings.LANGUAGES:
+        data = dict(serializer_class(instance, context={'language': language}).data)
+        for field in getattr(serializer_class, 'user_flag_fields', ()):
+            data.pop(field, None)
+        cards[language] = data
+    return cards
+
+
+def refresh_cards(instance, touch=False):
+    """
+    Rebuild and store the cards of a single row without re-triggering save().
+    ``touch`` also bumps ``updated_at``, for changes made outside the row itself
+    (e.g. to its category) that ETags and delta sync must still see.
+    """
+    changes = {}
+    if touch:
+        # Before rendering: cards embed updated_at
+        instance.updated_at = changes['updated_at'] = timezone.now()
+    instance.card_cache = changes['card_cache'] = build_cards(instance)
+    type(instance).objects.filter(pk=instance.pk).update(**changes)
+
+
+def refresh_category_cards(category_ids):
+    """Rebuild the cards of every listing and event that embeds one of the categories."""
+    for model in (Listing, Event):
+        for instance in model.objects.filter(category_id__in=category_ids).select_related('category'):
+            refresh_cards(instance, touch=True)
@@ -0,0 +1,54 @@
+"""
+Validators for conditional GETs on the content endpoints.
+
+ETags are derived from a single aggregate over the rows a response would contain
+(count, latest ``updated_at`` and the totals of counter columns that are updated
+without touching ``updated_at``) plus everything else the payload depends on:
+the full path, the content language and the caller's per-user flag state.
+"""
+import hashlib
+
+from django.db.models import Count, Max, Sum
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+
+def collection_state(queryset, timestamp_field='updated_at', counter_fields=()):
+    """
+    Return ``(count, latest timestamp, *counter totals)`` of a queryset with one
+    aggregate query.
+    """
+    counters = {f'total_{field}': Sum(field) for field in counter_fields}
+    state = queryset.order_by().aggregate(count=Count('pk'), latest=Max(timestamp_field), **counters)
+    return (state['count'], state['latest'], *(state[name] for name in counters))
+
+
+def make_etag(*parts):
+    """Build a weak ETag from the parts the representation depends on."""
+    digest = hashlib.md5('|'.join(str(part) for part in parts).encode(), usedforsecurity=False)
+    return f'W/"{digest.hexdigest()}"'
+
+
+def conditional_response(request, etag, last_modified, build_response, honor_last_modified=True):
+    """
+    Return 304 when the client's validators still match, otherwise build the response.
+
+    List validators can't express deletions through ``Last-Modified`` alone, so lists
+    pass ``honor_last_modified=False`` and are only answered with 304 via ``If-None-Match``.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=timestamp if honor_last_modified else None,
+    )
+    if response is None:
+        response = build_response()
+
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        # The content language also follows the guest's stored preference
+        patch_vary_headers(response, ('Authorization', 'Accept-Language', 'X-Guest-Id'))
+    return response
@@ -0,0 +1,33 @@
+"""
+Denormalized counters kept on content rows.
+
+``save_count`` is the number of users who wishlisted an object. Wishlist mutations
+adjust it with ``F()`` updates in the same transaction as the rows they change;
+``reconcile_counters`` repairs any drift (e.g. wishlist rows removed by cascades).
+"""
+from collections import defaultdict
+
+from django.db.models import F
+
+from .models import Listing, Event, Promotion
+
+SAVE_COUNTED_MODELS = (Listing, Event, Promotion)
+
+
+def adjust_save_counts(model, object_ids, delta):
+    """Add ``delta`` to the save_count of the given objects (no-op for uncounted models)."""
+    if model not in SAVE_COUNTED_MODELS or not object_ids:
+        return
+    queryset = model.objects.filter(pk__in=object_ids)
+    if delta < 0:
+        queryset = queryset.filter(save_count__gte=-delta)
+    queryset.update(save_count=F('save_count') + delta)
+
+
+def adjust_wishlist_save_counts(wishlist_rows, delta):
+    """Adjust save counts for ``(content_type, object_id)`` pairs, one UPDATE per content type."""
+    ids_by_model = defaultdict(list)
+    for content_type, object_id in wishlist_rows:
+        ids_by_model[content_type.model_class()].append(object_id)
+    for model, object_ids in ids_by_model.items():
+        adjust_save_counts(model, object_ids, delta)
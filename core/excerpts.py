@@ -0,0 +1,21 @@
+"""
+Plain-text excerpts of blog posts, stored on save so list payloads never need the
+full ``content`` columns.
+"""
+import re
+
+from django.utils.html import strip_tags
+
+EXCERPT_LENGTH = 200
+
+# Markdown markup that shouldn't leak into a plain-text excerpt
+MARKDOWN_MARKUP = re.compile(r'!?\[([^\]]*)\]\([^)]*\)|[#*_`>~|]+')
+
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    """Return the first ``length`` characters of the text without markup, cut at a word."""
+    text = MARKDOWN_MARKUP.sub(lambda match: match.group(1) or ' ', strip_tags(text or ''))
+    text = ' '.join(text.split())
+    if len(text) <= length:
+        return text
+    return text[:length].rsplit(' ', 1)[0].rstrip('.,;:!?') + '…'
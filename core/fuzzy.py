@@ -0,0 +1,150 @@
+"""
+Transliteration-aware fuzzy matching for listings, events and promotions.
+
+Titles, tags and addresses are normalized (lowercased, Macedonian Cyrillic and
+Latin diacritics folded to plain Latin) and split into pg_trgm style trigrams
+stored in an indexed table, so "Гевгелија", "Gevgelija" and "Gevgelia" match
+each other on any database backend.
+"""
+import re
+import unicodedata
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count, F, FloatField
+from django.db.models.functions import Cast
+
+from .models import Listing, Event, Promotion, FuzzyTerm, FuzzyTrigram
+
+FUZZY_TYPES = {
+    'listing': Listing,
+    'event': Event,
+    'promotion': Promotion,
+}
+
+DEFAULT_THRESHOLD = 0.3
+
+# Macedonian Cyrillic to Latin, plus the Latin diacritic spellings of the same sounds
+TRANSLITERATION = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'ѓ': 'gj', 'е': 'e',
+    'ж': 'zh', 'з': 'z', 'ѕ': 'dz', 'и': 'i', 'ј': 'j', 'к': 'k', 'л': 'l',
+    'љ': 'lj', 'м': 'm', 'н': 'n', 'њ': 'nj', 'о': 'o', 'п': 'p', 'р': 'r',
+    'с': 's', 'т': 't', 'ќ': 'kj', 'у': 'u', 'ф': 'f', 'х': 'h', 'ц': 'c',
+    'ч': 'ch', 'џ': 'dj', 'ш': 'sh',
+    'ǵ': 'gj', 'ḱ': 'kj', 'ž': 'zh', 'č': 'ch', 'š': 'sh', 'ć': 'kj', 'đ': 'dj',
+}
+
+MAX_TERM_LENGTH = 255
+MIN_WORD_LENGTH = 3
+
+
+def normalize(text):
+    """Lowercase, transliterate to Latin, strip accents and punctuation."""
+    text = ''.join(TRANSLITERATION.get(char, char) for char in str(text).lower())
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(re.findall(r'[a-z0-9]+', text))
+
+
+def trigrams(text):
+    """Return the set of trigrams of normalized text, padding each word like pg_trgm."""
+    grams = set()
+    for word in text.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _source_values(instance):
+    if isinstance(instance, Listing):
+        return [
+            instance.title_en, instance.title_mk, instance.address_en, instance.address_mk,
+            *(instance.tags or []), *(instance.tags_mk or []),
+        ]
+    if isinstance(instance, Event):
+        return [instance.title_en, instance.title_mk, instance.location_en, instance.location_mk]
+    return [
+        instance.title_en, instance.title_mk, instance.address_en, instance.address_mk,
+        *(instance.tags or []), *(instance.tags_mk or []),
+    ]
+
+
+def fuzzy_terms(instance):
+    """Return the normalized terms of an object: every value plus its individual words."""
+    terms = set()
+    for value in _source_values(instance):
+        if not value or not isinstance(value, str):
+            continue
+        normalized = normalize(value)[:MAX_TERM_LENGTH]
+        if not normalized:
+            continue
+        terms.add(normalized)
+        terms.update(word for word in normalized.split() if len(word) >= MIN_WORD_LENGTH)
+    return terms
+
+
+@transaction.atomic
+def index_fuzzy(instance):
+    """Bring the fuzzy terms of an object up to date, touching only the terms that changed."""
+    content_type = ContentType.objects.get_for_model(instance)
+    existing = dict(FuzzyTerm.objects.filter(
+        content_type=content_type, object_id=instance.pk
+    ).values_list('term', 'id'))
+    wanted = fuzzy_terms(instance)
+
+    stale_ids = [term_id for term, term_id in existing.items() if term not in wanted]
+    if stale_ids:
+        FuzzyTerm.objects.filter(id__in=stale_ids).delete()
+
+    grams_by_term = {term: trigrams(term) for term in wanted if term not in existing}
+    if not grams_by_term:
+        return
+    created = FuzzyTerm.objects.bulk_create([
+        FuzzyTerm(content_type=content_type, object_id=instance.pk, term=term, trigram_count=len(grams))
+        for term, grams in grams_by_term.items()
+    ])
+    # bulk_create doesn't return primary keys on every backend, so read them back
+    term_ids = dict(FuzzyTerm.objects.filter(
+        content_type=content_type, object_id=instance.pk, term__in=[term.term for term in created]
+    ).values_list('term', 'id'))
+    FuzzyTrigram.objects.bulk_create([
+        FuzzyTrigram(term_id=term_ids[term], trigram=gram)
+        for term, grams in grams_by_term.items()
+        for gram in grams
+    ])
+
+
+def remove_fuzzy(instance):
+    FuzzyTerm.objects.filter(
+        content_type=ContentType.objects.get_for_model(instance),
+        object_id=instance.pk,
+    ).delete()
+
+
+def fuzzy_search(query, types=None, threshold=DEFAULT_THRESHOLD, limit=20, offset=0):
+    """
+    Return ``(content_type_id, object_id, similarity)`` hits whose best matching term
+    has a trigram similarity of at least ``threshold``, most similar first.
+    """
+    query_grams = trigrams(normalize(query))
+    if not query_grams:
+        return []
+
+    terms = FuzzyTerm.objects.filter(trigrams__trigram__in=query_grams)
+    if types:
+        terms = terms.filter(content_type__in=[
+            ContentType.objects.get_for_model(FUZZY_TYPES[name]) for name in types
+        ])
+    # Same measure as pg_trgm similarity(): shared / (query + term - shared)
+    terms = terms.annotate(shared=Count('trigrams')).annotate(
+        similarity=Cast('shared', FloatField()) / (len(query_grams) + F('trigram_count') - F('shared'))
+    ).filter(similarity__gte=threshold)
+
+    best = {}
+    for content_type_id, object_id, similarity in terms.values_list('content_type_id', 'object_id', 'similarity'):
+        key = (content_type_id, object_id)
+        if similarity > best.get(key, 0):
+            best[key] = similarity
+
+    hits = sorted(best.items(), key=lambda hit: (-hit[1], -hit[0][1]))
+    return [(content_type_id, object_id, similarity) for (content_type_id, object_id), similarity in hits[offset:offset + limit]]
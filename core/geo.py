@@ -0,0 +1,78 @@
+"""
+"Near me" filtering without PostGIS.
+
+Coordinates are bucketed into a fixed grid of ``CELL_DEGREES`` cells stored in an
+indexed ``geo_cell`` column. A radius query first narrows rows to the grid cells
+and bounding box around the point (index lookups), then computes the exact
+haversine distance in SQL for the survivors and ranks by it.
+"""
+import math
+
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+CELL_DEGREES = 0.05
+DEFAULT_RADIUS_KM = 5.0
+MAX_RADIUS_KM = 50.0
+
+
+def _cell_index(value):
+    return math.floor(value / CELL_DEGREES)
+
+
+def geo_cell(latitude, longitude):
+    """Return the grid cell key of a coordinate, or '' when it is incomplete."""
+    if latitude is None or longitude is None:
+        return ''
+    return f'{_cell_index(latitude)}:{_cell_index(longitude)}'
+
+
+def parse_point(value):
+    """Parse ``"lat,lon"``, raising ValueError for malformed or out-of-range input."""
+    latitude, longitude = (float(part) for part in value.split(','))
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError('Coordinates out of range')
+    return latitude, longitude
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """Return ``(min_lat, max_lat, min_lon, max_lon)`` enclosing the radius."""
+    lat_delta = radius_km / KM_PER_DEGREE
+    lon_delta = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+    return (
+        max(latitude - lat_delta, -90.0), min(latitude + lat_delta, 90.0),
+        max(longitude - lon_delta, -180.0), min(longitude + lon_delta, 180.0),
+    )
+
+
+def covering_cells(min_lat, max_lat, min_lon, max_lon):
+    return [
+        f'{lat_cell}:{lon_cell}'
+        for lat_cell in range(_cell_index(min_lat), _cell_index(max_lat) + 1)
+        for lon_cell in range(_cell_index(min_lon), _cell_index(max_lon) + 1)
+    ]
+
+
+def haversine_expression(latitude, longitude):
+    """Great-circle distance in km from a point to the row's coordinates, as a SQL expression."""
+    lat = Value(math.radians(latitude))
+    lon = Value(math.radians(longitude))
+    a = (
+        Power(Sin((Radians(F('latitude')) - lat) / 2), 2)
+        + Cos(lat) * Cos(Radians(F('latitude'))) * Power(Sin((Radians(F('longitude')) - lon) / 2), 2)
+    )
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Sqrt(a), output_field=FloatField())
+
+
+def filter_nearby(queryset, latitude, longitude, radius_km):
+    """Restrict a queryset to rows within ``radius_km``, annotated with ``distance_km`` and nearest first."""
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    return queryset.filter(
+        geo_cell__in=covering_cells(min_lat, max_lat, min_lon, max_lon),
+        latitude__range=(min_lat, max_lat),
+        longitude__range=(min_lon, max_lon),
+    ).annotate(
+        distance_km=haversine_expression(latitude, longitude)
+    ).filter(distance_km__lte=radius_km).order_by('distance_km', 'id')
@@ -0,0 +1,104 @@
+"""
+Request-scoped resolution of the content language.
+
+The language is picked once per request, in order of precedence, from an explicit
+``?lang=``, the authenticated user's stored preference, the guest's stored
+preference (``X-Guest-Id`` header or ``?guest_id=``) and finally ``Accept-Language``.
+Stored preferences are read from the profile on a cache miss and cached; saving a
+profile refreshes the cached value (see ``signals.py``). The ``lang`` claim in issued
+tokens is informational only: it can't be revoked when the preference changes.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+
+from .models import GuestUser, UserProfile
+
+SUPPORTED_LANGUAGES = {code for code, _name in settings.LANGUAGES}
+DEFAULT_LANGUAGE = 'en'
+LANGUAGE_CLAIM = 'lang'
+GUEST_ID_HEADER = 'HTTP_X_GUEST_ID'
+
+# Saves refresh the cache of the process handling them; with a per-process cache
+# other workers pick a change up once their copy expires
+USER_LANGUAGE_TIMEOUT = 60 * 5
+GUEST_LANGUAGE_TIMEOUT = 60 * 5
+
+
+def user_language_key(user_id):
+    return f'language:user:{user_id}'
+
+
+def guest_language_key(guest_id):
+    return f'language:guest:{guest_id}'
+
+
+def remember_user_language(user_id, language):
+    cache.set(user_language_key(user_id), language, USER_LANGUAGE_TIMEOUT)
+
+
+def remember_guest_language(guest_id, language):
+    cache.set(guest_language_key(guest_id), language, GUEST_LANGUAGE_TIMEOUT)
+
+
+def get_user_language(user):
+    """Return the stored preference of a user, defaulting when there is no profile."""
+    try:
+        return user.profile.language_preference
+    except UserProfile.DoesNotExist:
+        return DEFAULT_LANGUAGE
+
+
+def _valid(language):
+    return language if language in SUPPORTED_LANGUAGES else None
+
+
+def _authenticated_language(request):
+    user = request.user
+    language = _valid(cache.get(user_language_key(user.id)))
+    if language:
+        return language
+
+    language = get_user_language(user)
+    remember_user_language(user.id, language)
+    return language
+
+
+def _guest_language(request):
+    guest_id = request.META.get(GUEST_ID_HEADER) or request.GET.get('guest_id')
+    if not guest_id:
+        return None
+
+    key = guest_language_key(guest_id)
+    language = _valid(cache.get(key))
+    if language:
+        return language
+
+    try:
+        language = GuestUser.objects.only('language_preference').get(
+            guest_id=guest_id
+        ).language_preference
+    except (GuestUser.DoesNotExist, ValidationError, ValueError):
+        return None
+    remember_guest_language(guest_id, language)
+    return language
+
+
+def resolve_language(request):
+    """Return the content language for a (DRF or Django) request, memoized on it."""
+    http_request = getattr(request, '_request', request)
+    language = getattr(http_request, '_content_language', None)
+    if language:
+        return language
+
+    language = _valid(request.GET.get('lang'))
+    if not language and request.user.is_authenticated:
+        language = _authenticated_language(request)
+    if not language:
+        language = _guest_language(request)
+    if not language:
+        # LocaleMiddleware has already negotiated Accept-Language
+        language = _valid(getattr(http_request, 'LANGUAGE_CODE', None)) or DEFAULT_LANGUAGE
+
+    http_request._content_language = language
+    return language
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core.trending import HALF_LIFE_DAYS, compute_trending
+
+
+class Command(BaseCommand):
+    help = 'Recompute time-decayed trending scores from event joins and wishlist saves and flag the trending categories (run periodically, e.g. hourly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--half-life-days', type=float, default=HALF_LIFE_DAYS,
+            help=f'Days after which an activity counts half (default {HALF_LIFE_DAYS})',
+        )
+
+    def handle(self, *args, **options):
+        changed = compute_trending(options['half_life_days'])
+        self.stdout.write(self.style.SUCCESS(f'Updated {changed} trending scores and flags'))
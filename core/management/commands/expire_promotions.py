@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Promotion
+from core.schedule import local_today
+
+
+class Command(BaseCommand):
+    help = 'Un-feature promotions whose valid_until date has passed (run daily, e.g. from cron shortly after midnight)'
+
+    def handle(self, *args, **options):
+        expired = Promotion.objects.filter(featured=True, valid_until__lt=local_today())
+
+        count = 0
+        for promotion in expired:
+            # Saved one by one so cards, indexes and cached payloads follow
+            promotion.featured = False
+            promotion.save()
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Un-featured {count} expired promotions'))
@@ -0,0 +1,30 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from core.counters import SAVE_COUNTED_MODELS
+from core.models import Event, EventJoin, Wishlist
+
+
+def counters():
+    """Yield ``(model, counter field, rows it counts, field of those rows holding the object id)``."""
+    yield Event, 'join_count', EventJoin.objects.all(), 'event'
+    for model in SAVE_COUNTED_MODELS:
+        saves = Wishlist.objects.filter(content_type=ContentType.objects.get_for_model(model))
+        yield model, 'save_count', saves, 'object_id'
+
+
+class Command(BaseCommand):
+    help = 'Recompute denormalized counters (event join counts, wishlist save counts) from the rows they count and fix any drift'
+
+    def handle(self, *args, **options):
+        for model, field, related_rows, related_field in counters():
+            actual = Coalesce(Subquery(
+                related_rows.filter(**{related_field: OuterRef('pk')})
+                .order_by().values(related_field).annotate(total=Count('pk')).values('total')
+            ), 0)
+            fixed = model.objects.annotate(actual=actual).exclude(**{field: F('actual')}).update(**{field: actual})
+            self.stdout.write(
+                self.style.SUCCESS(f'Fixed {fixed} {model._meta.verbose_name_plural} {field}')
+            )
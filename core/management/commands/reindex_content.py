@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from core.cards import CARD_SERIALIZERS, refresh_cards
+from core.signals import content_saved
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the derived per-row data (cached API cards, search and tag indexes, opening hours) of all content objects'
+
+    def handle(self, *args, **options):
+        for model in CARD_SERIALIZERS:
+            queryset = model.objects.all()
+            if hasattr(model, 'category') and model._meta.get_field('category').is_relation:
+                queryset = queryset.select_related('category')
+
+            count = 0
+            for instance in queryset.iterator(chunk_size=200):
+                previous_cards = instance.card_cache
+                content_saved(model, instance)
+                if instance.card_cache != previous_cards:
+                    # Delta sync and ETags have to see the re-rendered payload
+                    refresh_cards(instance, touch=True)
+                count += 1
+
+            self.stdout.write(
+                self.style.SUCCESS(f'Reindexed {count} {model._meta.verbose_name_plural}')
+            )
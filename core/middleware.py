@@ -0,0 +1,189 @@
+"""
+Compression and caching of the public content responses.
+
+JSON responses of the content endpoints are compressed with the best encoding the
+client accepts (brotli when the optional ``brotli`` package is installed, else gzip).
+Anonymous GETs are also cached per URL, content language and encoding in their
+compressed form, so repeated hits skip both serialization and compression. Entries
+embed the content version in their keys and expire after ``RESPONSE_CACHE_TIMEOUT``,
+which bounds how stale live counters can get, or earlier when a time-dependent
+list (upcoming events, active promotions, open listings) changes.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Min, Q
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from .caching import content_cache_key, timeout_until
+from .language import resolve_language
+from .models import Event, OpeningInterval, Promotion
+from .schedule import MINUTES_PER_WEEK, end_of_day, local_zone, minute_of_week
+
+CONTENT_PATH_PREFIXES = (
+    '/api/categories/', '/api/listings/', '/api/events/', '/api/promotions/',
+    '/api/blogs/', '/api/home/', '/api/tags/', '/api/search/',
+)
+# Bodies shorter than this don't shrink enough to be worth compressing
+MIN_COMPRESSED_LENGTH = 200
+CACHED_HEADERS = ('Content-Type', 'Content-Encoding', 'ETag', 'Last-Modified', 'Vary')
+
+# In order of preference
+ENCODERS = {'gzip': compress_string}
+if brotli is not None:
+    ENCODERS = {'br': brotli.compress, **ENCODERS}
+
+
+def negotiate_encoding(request):
+    """Return the preferred encoding the client accepts, or None for identity."""
+    accepted = {}
+    for coding in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        name, _, params = coding.partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    for encoding in ENCODERS:
+        if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+            return encoding
+    return None
+
+
+def is_json(response):
+    return response.get('Content-Type', '').startswith('application/json')
+
+
+def compress_response(response, encoding):
+    """Compress a JSON response in place with ``encoding`` when that makes it smaller."""
+    if response.streaming or not is_json(response) or response.has_header('Content-Encoding'):
+        return response
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if encoding is None or len(response.content) < MIN_COMPRESSED_LENGTH:
+        return response
+
+    compressed = ENCODERS[encoding](response.content)
+    if len(compressed) >= len(response.content):
+        return response
+
+    response.content = compressed
+    response['Content-Length'] = str(len(compressed))
+    response['Content-Encoding'] = encoding
+    # The compressed bytes differ from the identity representation
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = f'W/{etag}'
+    return response
+
+
+def next_content_change(now):
+    """
+    The soonest moment after ``now`` a time-dependent list can change without a
+    content edit: an event starts, a promotion expires or a listing opens or closes.
+    """
+    key = content_cache_key('next_change')
+    cached = cache.get(key)
+    if cached is not None and (cached[0] is None or cached[0] > now):
+        return cached[0]
+
+    zone = local_zone()
+    local_now = timezone.localtime(now, zone)
+    moments = [Event.objects.filter(starts_at__gt=now).aggregate(next=Min('starts_at'))['next']]
+
+    last_day = Promotion.objects.filter(valid_until__gte=local_now.date()).aggregate(next=Min('valid_until'))['next']
+    if last_day:
+        moments.append(end_of_day(last_day))
+
+    minute = minute_of_week(local_now)
+    boundaries = OpeningInterval.objects.aggregate(
+        opens=Min('opens_at', filter=Q(opens_at__gt=minute)),
+        closes=Min('closes_at', filter=Q(closes_at__gt=minute)),
+        first=Min('opens_at'),
+    )
+    boundary = min((value for value in (boundaries['opens'], boundaries['closes']) if value is not None), default=None)
+    if boundary is None and boundaries['first'] is not None:
+        boundary = boundaries['first'] + MINUTES_PER_WEEK
+    if boundary is not None:
+        week_start = datetime.combine(local_now.date() - timedelta(days=local_now.weekday()), time.min)
+        moments.append(timezone.make_aware(week_start + timedelta(minutes=boundary), zone))
+
+    moment = min((moment for moment in moments if moment is not None), default=None)
+    cache.set(key, (moment,), timeout_until(moment, settings.RESPONSE_CACHE_TIMEOUT, now))
+    return moment
+
+
+class CompressedResponseCacheMiddleware:
+    """Compress content responses and serve repeated anonymous GETs from the cache."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.timeout = settings.RESPONSE_CACHE_TIMEOUT
+
+    def __call__(self, request):
+        if not request.path.startswith(CONTENT_PATH_PREFIXES):
+            return self.get_response(request)
+
+        encoding = negotiate_encoding(request)
+        if not self.is_cacheable(request):
+            return compress_response(self.get_response(request), encoding)
+
+        # Paginated bodies embed absolute next/previous links
+        key = content_cache_key(
+            'response', request.scheme, request.get_host(), request.get_full_path(),
+            resolve_language(request), encoding or 'identity',
+        )
+        entry = cache.get(key)
+        if entry is not None:
+            return self.cached_response(request, entry)
+
+        response = compress_response(self.get_response(request), encoding)
+        if self.should_store(response):
+            now = timezone.now()
+            cache.set(key, {
+                'content': response.content,
+                'headers': {name: response[name] for name in CACHED_HEADERS if response.has_header(name)},
+            }, timeout_until(next_content_change(now), self.timeout, now))
+        return response
+
+    def is_cacheable(self, request):
+        """Only anonymous GETs share cached responses; per-user flags never leak."""
+        return (
+            self.timeout > 0
+            and request.method == 'GET'
+            and 'HTTP_AUTHORIZATION' not in request.META
+            and not request.user.is_authenticated
+        )
+
+    def should_store(self, response):
+        return (
+            response.status_code == 200
+            and not response.streaming
+            and is_json(response)
+            and not response.has_header('Set-Cookie')
+            and 'private' not in response.get('Cache-Control', '')
+            and 'no-store' not in response.get('Cache-Control', '')
+        )
+
+    def cached_response(self, request, entry):
+        headers = entry['headers']
+        response = get_conditional_response(request, etag=headers.get('ETag'))
+        if response is None:
+            response = HttpResponse(entry['content'])
+            response['Content-Length'] = str(len(entry['content']))
+        for name, value in headers.items():
+            if response.status_code == 200 or name in ('ETag', 'Last-Modified', 'Vary'):
+                response[name] = value
+        return response
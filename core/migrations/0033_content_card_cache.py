@@ -0,0 +1,33 @@
+# Generated by Django 5.1.15 on 2026-10-18 14:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0032_content_created_id_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='card_cache',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Pre-rendered API payload per language, rebuilt on save'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='card_cache',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Pre-rendered API payload per language, rebuilt on save'),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='card_cache',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Pre-rendered API payload per language, rebuilt on save'),
+        ),
+        migrations.AddField(
+            model_name='promotion',
+            name='card_cache',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Pre-rendered API payload per language, rebuilt on save'),
+        ),
+    ]
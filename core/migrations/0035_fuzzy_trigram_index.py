@@ -0,0 +1,44 @@
+# Generated by Django 5.1.15 on 2026-10-18 14:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('core', '0034_searchentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FuzzyTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('term', models.CharField(max_length=255)),
+                ('trigram_count', models.PositiveSmallIntegerField(default=0)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'unique_together': {('content_type', 'object_id', 'term')},
+            },
+        ),
+        migrations.CreateModel(
+            name='FuzzyTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3)),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trigrams', to='core.fuzzyterm')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='fuzzytrigram',
+            index=models.Index(fields=['trigram', 'term'], name='fuzzy_trigram_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='fuzzytrigram',
+            unique_together={('term', 'trigram')},
+        ),
+    ]
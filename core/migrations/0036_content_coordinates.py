@@ -0,0 +1,59 @@
+# Generated by Django 5.1.15 on 2026-10-18 14:25
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0035_fuzzy_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='geo_cell',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Spatial grid cell derived from the coordinates', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='latitude',
+            field=models.FloatField(blank=True, help_text='Latitude in decimal degrees', null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)]),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='longitude',
+            field=models.FloatField(blank=True, help_text='Longitude in decimal degrees', null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)]),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='geo_cell',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Spatial grid cell derived from the coordinates', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='latitude',
+            field=models.FloatField(blank=True, help_text='Latitude in decimal degrees', null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)]),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='longitude',
+            field=models.FloatField(blank=True, help_text='Longitude in decimal degrees', null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)]),
+        ),
+        migrations.AddField(
+            model_name='promotion',
+            name='geo_cell',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Spatial grid cell derived from the coordinates', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='promotion',
+            name='latitude',
+            field=models.FloatField(blank=True, help_text='Latitude in decimal degrees', null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)]),
+        ),
+        migrations.AddField(
+            model_name='promotion',
+            name='longitude',
+            field=models.FloatField(blank=True, help_text='Longitude in decimal degrees', null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)]),
+        ),
+    ]
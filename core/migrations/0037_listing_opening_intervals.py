@@ -0,0 +1,45 @@
+# Generated by Django 5.1.15 on 2026-10-18 14:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from core.schedule import listing_opening_intervals
+
+
+def compile_opening_hours(apps, schema_editor):
+    Listing = apps.get_model('core', 'Listing')
+    OpeningInterval = apps.get_model('core', 'OpeningInterval')
+    intervals = []
+    for listing in Listing.objects.only('id', 'working_hours', 'working_hours_mk').iterator():
+        intervals.extend(
+            OpeningInterval(listing_id=listing.id, opens_at=opens_at, closes_at=closes_at)
+            for opens_at, closes_at in listing_opening_intervals(listing)
+        )
+    OpeningInterval.objects.bulk_create(intervals, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0036_content_coordinates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OpeningInterval',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('opens_at', models.PositiveSmallIntegerField()),
+                ('closes_at', models.PositiveSmallIntegerField()),
+                ('listing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='opening_intervals', to='core.listing')),
+            ],
+            options={
+                'ordering': ['listing', 'opens_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='openinginterval',
+            index=models.Index(fields=['opens_at', 'closes_at'], name='opening_interval_idx'),
+        ),
+        migrations.RunPython(compile_opening_hours, migrations.RunPython.noop),
+    ]
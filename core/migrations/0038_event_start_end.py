@@ -0,0 +1,41 @@
+# Generated by Django 5.1.15 on 2026-10-18 14:29
+
+from django.db import migrations, models
+
+from core.schedule import parse_event_time
+
+
+def parse_event_times(apps, schema_editor):
+    Event = apps.get_model('core', 'Event')
+    events = []
+    for event in Event.objects.only('id', 'date_time', 'created_at').iterator():
+        # Relative text like "Fri, 20:00" was written relative to when the event was created
+        event.starts_at, event.ends_at = parse_event_time(event.date_time, event.created_at)
+        if event.starts_at:
+            events.append(event)
+    Event.objects.bulk_update(events, ['starts_at', 'ends_at'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0037_listing_opening_intervals'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='ends_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='End time, filled in when date_time gives a time range', null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='starts_at',
+            field=models.DateTimeField(blank=True, help_text='Start time, filled in from date_time when it changes', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['starts_at', 'id'], name='event_starts_id_idx'),
+        ),
+        migrations.RunPython(parse_event_times, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.15 on 2026-10-18 14:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0038_event_start_end'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='promotion',
+            index=models.Index(fields=['featured', 'valid_until'], name='promotion_featured_valid_idx'),
+        ),
+    ]
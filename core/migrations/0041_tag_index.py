@@ -0,0 +1,44 @@
+# Generated by Django 5.1.15 on 2026-10-18 14:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('core', '0040_content_sync'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(allow_unicode=True, max_length=100, unique=True)),
+                ('name', models.CharField(help_text='Display name as first written', max_length=100)),
+            ],
+            options={
+                'ordering': ['slug'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TagAssignment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('language', models.CharField(default='en', max_length=10)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignments', to='core.tag')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='tagassignment',
+            index=models.Index(fields=['content_type', 'object_id'], name='tag_assignment_object_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='tagassignment',
+            unique_together={('tag', 'content_type', 'object_id', 'language')},
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.1.15 on 2026-10-18 14:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0041_tag_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='trending_score',
+            field=models.FloatField(default=0, editable=False, help_text='Time-decayed recent activity, recomputed by compute_trending'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='trending_score',
+            field=models.FloatField(default=0, editable=False, help_text="Time-decayed recent activity of the category's content"),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='trending_score',
+            field=models.FloatField(default=0, editable=False, help_text='Time-decayed recent activity, recomputed by compute_trending'),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='trending_score',
+            field=models.FloatField(default=0, editable=False, help_text='Time-decayed recent activity, recomputed by compute_trending'),
+        ),
+        migrations.AddField(
+            model_name='promotion',
+            name='trending_score',
+            field=models.FloatField(default=0, editable=False, help_text='Time-decayed recent activity, recomputed by compute_trending'),
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='trending',
+            field=models.BooleanField(default=False, help_text='Show as trending category (maintained by compute_trending)'),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['-trending_score', 'id'], name='blog_trending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-trending_score', 'id'], name='event_trending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['-trending_score', 'id'], name='listing_trending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='promotion',
+            index=models.Index(fields=['-trending_score', 'id'], name='promotion_trending_idx'),
+        ),
+    ]
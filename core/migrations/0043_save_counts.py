@@ -0,0 +1,56 @@
+# Generated by Django 5.1.15 on 2026-10-18 14:37
+
+from django.db import migrations, models
+
+
+def count_saves(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    Wishlist = apps.get_model('core', 'Wishlist')
+    for name in ('listing', 'event', 'promotion'):
+        content_type = ContentType.objects.filter(app_label='core', model=name).first()
+        if content_type is None:
+            continue
+        model = apps.get_model('core', name)
+        saves = Wishlist.objects.filter(content_type=content_type).values('object_id').annotate(
+            total=models.Count('id')
+        ).values_list('object_id', 'total')
+        for object_id, total in saves:
+            model.objects.filter(pk=object_id).update(save_count=total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0042_trending_scores'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='save_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of users who saved this to their wishlist'),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='save_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of users who saved this to their wishlist'),
+        ),
+        migrations.AddField(
+            model_name='promotion',
+            name='save_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of users who saved this to their wishlist'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-save_count', 'id'], name='event_saves_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['-save_count', 'id'], name='listing_saves_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='promotion',
+            index=models.Index(fields=['-save_count', 'id'], name='promotion_saves_idx'),
+        ),
+        migrations.RunPython(count_saves, migrations.RunPython.noop),
+    ]
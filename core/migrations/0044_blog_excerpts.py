@@ -0,0 +1,37 @@
+# Generated by Django 5.1.15 on 2026-10-18 14:39
+
+from django.db import migrations, models
+
+from core.excerpts import make_excerpt
+
+
+def fill_excerpts(apps, schema_editor):
+    Blog = apps.get_model('core', 'Blog')
+    blogs = list(Blog.objects.only('id', 'content', 'content_en', 'content_mk'))
+    for blog in blogs:
+        blog.excerpt = make_excerpt(blog.content_en or blog.content)
+        blog.excerpt_mk = make_excerpt(blog.content_mk)
+        # Stored cards still carry the full content; lists serialize live until reindex_content
+        blog.card_cache = {}
+    Blog.objects.bulk_update(blogs, ['excerpt', 'excerpt_mk', 'card_cache'], batch_size=200)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0043_save_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, help_text='Plain-text start of the English content, filled in on save', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='excerpt_mk',
+            field=models.CharField(blank=True, editable=False, help_text='Plain-text start of the Macedonian content, filled in on save', max_length=255),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
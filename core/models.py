@@ -49,12 +49,17 @@ class Category(models.Model):
     name = models.CharField(max_length=50, unique=True)
     icon = models.CharField(max_length=50, help_text="Ionicon name (e.g., 'restaurant-outline')")
     image_url = models.URLField(max_length=1000, blank=True, null=True, help_text="Optional category image URL")
-    trending = models.BooleanField(default=False, help_text="Show as trending category")
+    trending = models.BooleanField(default=False, help_text="Show as trending category (maintained by compute_trending)")
+    trending_score = models.FloatField(default=0, editable=False, help_text="Time-decayed recent activity of the category's content")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         verbose_name_plural = "Categories"
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['updated_at'], name='category_updated_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -63,6 +68,9 @@ class Listing(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True, help_text="Listing description")
     address = models.CharField(max_length=500)
+    latitude = models.FloatField(null=True, blank=True, validators=[MinValueValidator(-90), MaxValueValidator(90)], help_text="Latitude in decimal degrees")
+    longitude = models.FloatField(null=True, blank=True, validators=[MinValueValidator(-180), MaxValueValidator(180)], help_text="Longitude in decimal degrees")
+    geo_cell = models.CharField(max_length=20, blank=True, db_index=True, editable=False, help_text="Spatial grid cell derived from the coordinates")
     open_time = models.CharField(max_length=100, help_text="e.g., 'Open until 23:00' or 'Mon-Fri 9:00-18:00'")
     working_hours = models.JSONField(
         default=dict, 
@@ -81,11 +89,20 @@ class Listing(models.Model):
     instagram_url = models.URLField(max_length=500, blank=True, null=True, help_text="Instagram profile URL")
     website_url = models.URLField(max_length=500, blank=True, null=True, help_text="Official website URL")
     featured = models.BooleanField(default=False, help_text="Show in featured section")
+    card_cache = models.JSONField(default=dict, blank=True, editable=False, help_text="Pre-rendered API payload per language, rebuilt on save")
+    trending_score = models.FloatField(default=0, editable=False, help_text="Time-decayed recent activity, recomputed by compute_trending")
+    save_count = models.PositiveIntegerField(default=0, editable=False, help_text="Number of users who saved this to their wishlist")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='listing_created_id_idx'),
+            models.Index(fields=['updated_at'], name='listing_updated_idx'),
+            models.Index(fields=['-trending_score', 'id'], name='listing_trending_idx'),
+            models.Index(fields=['-save_count', 'id'], name='listing_saves_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -95,7 +112,12 @@ class Event(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True, help_text="Event description")
     date_time = models.CharField(max_length=100, help_text="e.g., 'Fri, 20:00' or 'Dec 25, 18:00'")
+    starts_at = models.DateTimeField(null=True, blank=True, help_text="Start time, filled in from date_time when it changes")
+    ends_at = models.DateTimeField(null=True, blank=True, db_index=True, help_text="End time, filled in when date_time gives a time range")
     location = models.CharField(max_length=255, help_text="Event venue/location")
+    latitude = models.FloatField(null=True, blank=True, validators=[MinValueValidator(-90), MaxValueValidator(90)], help_text="Latitude in decimal degrees")
+    longitude = models.FloatField(null=True, blank=True, validators=[MinValueValidator(-180), MaxValueValidator(180)], help_text="Longitude in decimal degrees")
+    geo_cell = models.CharField(max_length=20, blank=True, db_index=True, editable=False, help_text="Spatial grid cell derived from the coordinates")
     cover_image = models.URLField(max_length=1000, help_text="URL to the event cover image")
     entry_price = models.CharField(max_length=50, default="Free", help_text="Entry price (e.g., 'Free', '10 EUR', '500 MKD')")
     entry_price_mk = models.CharField(max_length=50, blank=True, help_text="Entry price in Macedonian (e.g., 'Бесплатно', '10 ЕУР', '500 МКД')")
@@ -106,11 +128,21 @@ class Event(models.Model):
     expectations_mk = models.JSONField(default=list, help_text="List of expectations in Macedonian with icons, e.g., [{'icon': 'musical-notes', 'text': 'Музика во живо'}, {'icon': 'restaurant', 'text': 'Достапна храна'}]")
     join_count = models.PositiveIntegerField(default=0, help_text="Number of users who joined this event")
     featured = models.BooleanField(default=False, help_text="Show in featured events")
+    card_cache = models.JSONField(default=dict, blank=True, editable=False, help_text="Pre-rendered API payload per language, rebuilt on save")
+    trending_score = models.FloatField(default=0, editable=False, help_text="Time-decayed recent activity, recomputed by compute_trending")
+    save_count = models.PositiveIntegerField(default=0, editable=False, help_text="Number of users who saved this to their wishlist")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='event_created_id_idx'),
+            models.Index(fields=['updated_at'], name='event_updated_idx'),
+            models.Index(fields=['-trending_score', 'id'], name='event_trending_idx'),
+            models.Index(fields=['-save_count', 'id'], name='event_saves_idx'),
+            models.Index(fields=['starts_at', 'id'], name='event_starts_id_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.date_time}"
@@ -131,11 +163,24 @@ class Promotion(models.Model):
     facebook_url = models.URLField(max_length=500, blank=True, help_text="Facebook page URL")
     instagram_url = models.URLField(max_length=500, blank=True, help_text="Instagram profile URL")
     address = models.CharField(max_length=500, blank=True, help_text="Physical address")
+    latitude = models.FloatField(null=True, blank=True, validators=[MinValueValidator(-90), MaxValueValidator(90)], help_text="Latitude in decimal degrees")
+    longitude = models.FloatField(null=True, blank=True, validators=[MinValueValidator(-180), MaxValueValidator(180)], help_text="Longitude in decimal degrees")
+    geo_cell = models.CharField(max_length=20, blank=True, db_index=True, editable=False, help_text="Spatial grid cell derived from the coordinates")
+    card_cache = models.JSONField(default=dict, blank=True, editable=False, help_text="Pre-rendered API payload per language, rebuilt on save")
+    trending_score = models.FloatField(default=0, editable=False, help_text="Time-decayed recent activity, recomputed by compute_trending")
+    save_count = models.PositiveIntegerField(default=0, editable=False, help_text="Number of users who saved this to their wishlist")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='promotion_created_id_idx'),
+            models.Index(fields=['updated_at'], name='promotion_updated_idx'),
+            models.Index(fields=['-trending_score', 'id'], name='promotion_trending_idx'),
+            models.Index(fields=['-save_count', 'id'], name='promotion_saves_idx'),
+            models.Index(fields=['featured', 'valid_until'], name='promotion_featured_valid_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.discount_code}"
@@ -156,6 +201,8 @@ class Blog(models.Model):
     title = models.CharField(max_length=255)
     subtitle = models.CharField(max_length=500, blank=True, help_text="Brief subtitle or summary")
     content = models.TextField(help_text="Full blog post content")
+    excerpt = models.CharField(max_length=255, blank=True, editable=False, help_text="Plain-text start of the English content, filled in on save")
+    excerpt_mk = models.CharField(max_length=255, blank=True, editable=False, help_text="Plain-text start of the Macedonian content, filled in on save")
     author = models.CharField(max_length=100, default="GoGevgelija Team")
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default='other')
     tags = models.JSONField(default=list, help_text="List of tags, e.g., ['Travel', 'Food', 'Culture']")
@@ -163,11 +210,18 @@ class Blog(models.Model):
     read_time_minutes = models.PositiveIntegerField(default=5, help_text="Estimated reading time in minutes")
     featured = models.BooleanField(default=False, help_text="Show in featured blogs")
     published = models.BooleanField(default=True, help_text="Whether the blog is published")
+    card_cache = models.JSONField(default=dict, blank=True, editable=False, help_text="Pre-rendered API payload per language, rebuilt on save")
+    trending_score = models.FloatField(default=0, editable=False, help_text="Time-decayed recent activity, recomputed by compute_trending")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='blog_created_id_idx'),
+            models.Index(fields=['updated_at'], name='blog_updated_idx'),
+            models.Index(fields=['-trending_score', 'id'], name='blog_trending_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -235,4 +289,124 @@ class UserPermission(models.Model):
         ordering = ['-created_at']
     
     def __str__(self):
-        return f"{self.user.username} can edit {self.listing.title}"
\ No newline at end of file
+        return f"{self.user.username} can edit {self.listing.title}"
+
+class SearchEntry(models.Model):
+    """
+    Denormalized full-text search document for a Listing, Event, Promotion or Blog,
+    combining the English and Macedonian columns. Kept in sync on save; searched
+    through a tsvector/GIN index on PostgreSQL and an FTS5 shadow table on SQLite.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey('content_type', 'object_id')
+    title = models.TextField(blank=True, help_text="Titles in all languages (highest search weight)")
+    body = models.TextField(blank=True, help_text="Descriptions, addresses, tags and other searchable text")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ('content_type', 'object_id')
+        verbose_name_plural = "Search entries"
+    
+    def __str__(self):
+        return f"{self.content_type.model} #{self.object_id}"
+
+
+class FuzzyTerm(models.Model):
+    """
+    A normalized, Latin-transliterated title, tag, address or single word of a
+    Listing, Event or Promotion, matched by trigram similarity.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    term = models.CharField(max_length=255)
+    trigram_count = models.PositiveSmallIntegerField(default=0)
+    
+    class Meta:
+        unique_together = ('content_type', 'object_id', 'term')
+    
+    def __str__(self):
+        return self.term
+
+
+class FuzzyTrigram(models.Model):
+    """Inverted index entry: one trigram of a FuzzyTerm."""
+    term = models.ForeignKey(FuzzyTerm, on_delete=models.CASCADE, related_name='trigrams')
+    trigram = models.CharField(max_length=3)
+    
+    class Meta:
+        unique_together = ('term', 'trigram')
+        indexes = [
+            models.Index(fields=['trigram', 'term'], name='fuzzy_trigram_idx'),
+        ]
+    
+    def __str__(self):
+        return self.trigram
+
+
+class OpeningInterval(models.Model):
+    """
+    A normalized opening interval of a listing, compiled from its working hours on save.
+    Times are minutes since Monday 00:00 local time, half-open ``[opens_at, closes_at)``.
+    """
+    listing = models.ForeignKey(Listing, on_delete=models.CASCADE, related_name='opening_intervals')
+    opens_at = models.PositiveSmallIntegerField()
+    closes_at = models.PositiveSmallIntegerField()
+    
+    class Meta:
+        ordering = ['listing', 'opens_at']
+        indexes = [
+            models.Index(fields=['opens_at', 'closes_at'], name='opening_interval_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.listing.title}: {self.opens_at}-{self.closes_at}"
+
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted Listing, Event, Promotion, Blog or Category, so clients syncing
+    changes since a point in time learn about deletions.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-deleted_at']
+        indexes = [
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.content_type.model} #{self.object_id} deleted"
+
+
+class Tag(models.Model):
+    """A normalized tag shared by every object that carries it in any language."""
+    slug = models.SlugField(max_length=100, unique=True, allow_unicode=True)
+    name = models.CharField(max_length=100, help_text="Display name as first written")
+    
+    class Meta:
+        ordering = ['slug']
+    
+    def __str__(self):
+        return self.name
+
+
+class TagAssignment(models.Model):
+    """Inverted index entry: a Listing, Promotion or Blog carries a tag in a language."""
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='assignments')
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey('content_type', 'object_id')
+    language = models.CharField(max_length=10, default='en')
+    
+    class Meta:
+        unique_together = ('tag', 'content_type', 'object_id', 'language')
+        indexes = [
+            models.Index(fields=['content_type', 'object_id'], name='tag_assignment_object_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.content_type.model} #{self.object_id}: {self.tag.slug}"
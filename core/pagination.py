@@ -0,0 +1,28 @@
+from rest_framework.pagination import CursorPagination
+
+
+class OptionalCursorPagination(CursorPagination):
+    """
+    Keyset pagination over ``(-created_at, id)`` (or the view's ``get_cursor_ordering()``)
+    with an opaque cursor and no COUNT(*).
+    Pagination is opt-in: requests that send neither ``cursor`` nor ``page_size``
+    get the full unpaginated list, so existing clients keep working.
+    """
+    ordering = ('-created_at', 'id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def is_requested(self, request):
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_ordering(self, request, queryset, view):
+        """Let the view key the cursor on another ordering (e.g. distance) for the request."""
+        ordering = getattr(view, 'get_cursor_ordering', lambda: None)()
+        return ordering or self.ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+        return super().paginate_queryset(queryset, request, view)
@@ -0,0 +1,311 @@
+"""
+Parsing of the free-form schedule text stored on content rows.
+
+``Listing.working_hours`` holds JSON such as ``{"monday": "09:00-18:00"}``,
+``{"Mon-Fri": "9-17", "Sat": "closed"}``, ``{"daily": "9am-5pm"}`` or a plain ``"09:00-18:00"``, in English
+or Macedonian. ``parse_working_hours`` turns it into merged half-open intervals of
+minutes since Monday 00:00 so "open now" can be answered by an indexed range query.
+
+``Event.date_time`` holds text such as ``"Fri, 20:00"``, ``"Dec 25, 18:00"`` or
+``"25.12.2026 20:00-23:00"``; ``parse_event_time`` resolves it to datetimes relative
+to the moment the text was written.
+"""
+import re
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+ALL_DAYS = tuple(range(7))
+
+_WEEKDAY_NAMES = [
+    ('monday', 'mon', 'понеделник', 'пон'),
+    ('tuesday', 'tue', 'tues', 'вторник', 'вто'),
+    ('wednesday', 'wed', 'среда', 'сре'),
+    ('thursday', 'thu', 'thur', 'thurs', 'четврток', 'чет'),
+    ('friday', 'fri', 'петок', 'пет'),
+    ('saturday', 'sat', 'сабота', 'саб'),
+    ('sunday', 'sun', 'недела', 'нед'),
+]
+
+DAY_ALIASES = {name: (index,) for index, names in enumerate(_WEEKDAY_NAMES) for name in names}
+DAY_ALIASES.update({
+    'weekdays': ALL_DAYS[:5], 'работни денови': ALL_DAYS[:5],
+    'weekends': ALL_DAYS[5:], 'weekend': ALL_DAYS[5:], 'викенд': ALL_DAYS[5:],
+    'daily': ALL_DAYS, 'everyday': ALL_DAYS, 'every day': ALL_DAYS, 'секој ден': ALL_DAYS,
+})
+
+_DAY = '|'.join(re.escape(name) for name in sorted(DAY_ALIASES, key=len, reverse=True))
+_DASH = r'\s*(?:-|–|—|to|до)\s*'
+
+SCHEDULE_TOKEN = re.compile(
+    rf'(?P<day_range>\b(?P<first_day>{_DAY})\b{_DASH}\b(?P<last_day>{_DAY})\b)'
+    rf'|(?P<day>\b(?:{_DAY})\b)'
+    rf'|(?P<all_day>24/7|24h|non-?stop|цел ден)'
+    rf'|(?P<time_range>(?P<open_h>\d{{1,2}})(?:[:.](?P<open_m>\d{{2}}))?(?:\s*(?P<open_ampm>am|pm)\b)?{_DASH}'
+    rf'(?P<close_h>\d{{1,2}})(?:[:.](?P<close_m>\d{{2}}))?(?:\s*(?P<close_ampm>am|pm)\b)?)'
+    rf'|(?P<closed>closed|затворено)',
+    re.IGNORECASE,
+)
+
+
+def _days(token):
+    if token['day_range']:
+        first = DAY_ALIASES[token['first_day'].lower()][0]
+        last = DAY_ALIASES[token['last_day'].lower()][-1]
+        return tuple((first + offset) % 7 for offset in range((last - first) % 7 + 1))
+    return DAY_ALIASES[token['day'].lower()]
+
+
+def _minutes(hours, minutes, meridiem=None):
+    hours, minutes = int(hours), int(minutes or 0)
+    if meridiem:
+        if not 1 <= hours <= 12:
+            raise ValueError('Invalid clock time')
+        hours = hours % 12 + (12 if meridiem.lower() == 'pm' else 0)
+    if hours > 24 or minutes > 59 or (hours == 24 and minutes):
+        raise ValueError('Invalid clock time')
+    return hours * 60 + minutes
+
+
+def _time_range(token):
+    """Opening and closing minute of the day of a time range such as ``9-17`` or ``9am-5pm``."""
+    closes = _minutes(token['close_h'], token['close_m'], token['close_ampm'])
+    open_ampm = token['open_ampm']
+    if not open_ampm and token['close_ampm']:
+        # "1-5pm" shares the closing meridiem, "9-5pm" opens in the morning
+        open_ampm = token['close_ampm']
+        if _minutes(token['open_h'], token['open_m'], open_ampm) > closes:
+            open_ampm = 'am'
+    return _minutes(token['open_h'], token['open_m'], open_ampm), closes
+
+
+def _parse_text(text, default_days=ALL_DAYS):
+    """
+    Yield ``(day, opens, closes)`` in minutes of the day from schedule text.
+    Time ranges apply to the day names preceding them, or to ``default_days``.
+    """
+    days = None
+    after_hours = False
+    for token in SCHEDULE_TOKEN.finditer(text):
+        if token['day_range'] or token['day']:
+            if days is None or after_hours:
+                days = set()
+            days.update(_days(token))
+            after_hours = False
+            continue
+
+        after_hours = True
+        if token['closed']:
+            continue
+        if token['all_day']:
+            opens, closes = 0, MINUTES_PER_DAY
+        else:
+            try:
+                opens, closes = _time_range(token)
+            except ValueError:
+                continue
+        for day in sorted(days if days is not None else default_days):
+            yield day, opens, closes
+
+
+def _week_intervals(entries):
+    """Convert day-relative entries to minute-of-week intervals, splitting at the week boundary."""
+    for day, opens, closes in entries:
+        if closes <= opens:
+            # Closes after midnight (e.g. 22:00-02:00) or open around the clock (00:00-00:00)
+            closes += MINUTES_PER_DAY
+        start = day * MINUTES_PER_DAY + opens
+        end = day * MINUTES_PER_DAY + closes
+        if end > MINUTES_PER_WEEK:
+            yield start, MINUTES_PER_WEEK
+            yield 0, end - MINUTES_PER_WEEK
+        else:
+            yield start, end
+
+
+def _merge(intervals):
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def parse_working_hours(value):
+    """Return merged ``(opens_at, closes_at)`` minute-of-week intervals for working hours JSON."""
+    entries = []
+    if isinstance(value, dict):
+        for key, hours in value.items():
+            day_tokens = [token for token in SCHEDULE_TOKEN.finditer(str(key)) if token['day_range'] or token['day']]
+            if not day_tokens:
+                continue
+            days = {day for token in day_tokens for day in _days(token)}
+            if isinstance(hours, dict):
+                hours = f"{hours.get('open', '')}-{hours.get('close', '')}"
+            elif isinstance(hours, (list, tuple)):
+                hours = ', '.join(str(item) for item in hours)
+            entries.extend(_parse_text(str(hours), days))
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            entries.extend(_parse_text(str(item)))
+    elif isinstance(value, str):
+        entries.extend(_parse_text(value))
+    return _merge(_week_intervals(entries))
+
+
+def minute_of_week(moment):
+    """Minutes since Monday 00:00 of a (local) datetime."""
+    return moment.weekday() * MINUTES_PER_DAY + moment.hour * 60 + moment.minute
+
+
+def listing_opening_intervals(listing):
+    """Compile a listing's working hours, falling back to the Macedonian ones."""
+    return parse_working_hours(listing.working_hours) or parse_working_hours(listing.working_hours_mk)
+
+
+def local_zone():
+    """The time zone schedules are entered in."""
+    return ZoneInfo(settings.LOCAL_TIME_ZONE)
+
+
+def local_today():
+    return timezone.localdate(timezone=local_zone())
+
+
+def end_of_day(day):
+    """The moment a date-only validity such as ``Promotion.valid_until`` runs out."""
+    return timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min), local_zone())
+
+
+_MONTH_NAMES = [
+    ('january', 'jan', 'јануари', 'јан'),
+    ('february', 'feb', 'февруари', 'фев'),
+    ('march', 'mar', 'март', 'мар'),
+    ('april', 'apr', 'април', 'апр'),
+    ('may', 'мај'),
+    ('june', 'jun', 'јуни', 'јун'),
+    ('july', 'jul', 'јули', 'јул'),
+    ('august', 'aug', 'август', 'авг'),
+    ('september', 'sep', 'sept', 'септември', 'сеп'),
+    ('october', 'oct', 'октомври', 'окт'),
+    ('november', 'nov', 'ноември', 'ное'),
+    ('december', 'dec', 'декември', 'дек'),
+]
+
+MONTH_ALIASES = {name: index + 1 for index, names in enumerate(_MONTH_NAMES) for name in names}
+RELATIVE_DAYS = {'today': 0, 'tonight': 0, 'денес': 0, 'вечерва': 0, 'tomorrow': 1, 'утре': 1}
+
+_MONTH = '|'.join(re.escape(name) for name in sorted(MONTH_ALIASES, key=len, reverse=True))
+_WEEKDAY = '|'.join(re.escape(name) for name in sorted(
+    (name for name, days in DAY_ALIASES.items() if len(days) == 1), key=len, reverse=True,
+))
+_RELATIVE = '|'.join(RELATIVE_DAYS)
+
+EVENT_DATE = re.compile(
+    r'(?P<iso_year>\d{4})-(?P<iso_month>\d{1,2})-(?P<iso_day>\d{1,2})'
+    r'|(?P<num_day>\d{1,2})[./](?P<num_month>\d{1,2})(?:[./](?P<num_year>\d{4}|\d{2})\b)?'
+    rf'|\b(?P<name_month>{_MONTH})\.?\s+(?P<name_day>\d{{1,2}})\b(?:,?\s+(?P<name_year>\d{{4}}))?'
+    rf'|\b(?P<day_first>\d{{1,2}})\.?\s+(?P<month_after>{_MONTH})\b\.?(?:,?\s+(?P<year_after>\d{{4}}))?'
+    rf'|\b(?P<relative>{_RELATIVE})\b'
+    rf'|\b(?P<weekday>{_WEEKDAY})\b',
+    re.IGNORECASE,
+)
+
+EVENT_TIME = re.compile(
+    r'\b(?P<start_h>\d{1,2})(?:[:.](?P<start_m>\d{2})|(?P<hour_mark>h|ч))?\s*(?P<start_ampm>am|pm)?'
+    rf'(?:{_DASH}(?P<end_h>\d{{1,2}})(?:[:.](?P<end_m>\d{{2}}))?\s*(?P<end_ampm>am|pm)?)?\b',
+    re.IGNORECASE,
+)
+
+
+def _clock(hours, minutes, meridiem):
+    hours, minutes = int(hours), int(minutes or 0)
+    if meridiem:
+        if not 1 <= hours <= 12:
+            raise ValueError('Invalid clock time')
+        hours = hours % 12 + (12 if meridiem.lower() == 'pm' else 0)
+    return time(hours, minutes)
+
+
+def _event_date(token, today):
+    """Resolve a date token; dates without a year fall on or after ``today``."""
+    if token['weekday']:
+        weekday = DAY_ALIASES[token['weekday'].lower()][0]
+        return today + timedelta(days=(weekday - today.weekday()) % 7)
+    if token['relative']:
+        return today + timedelta(days=RELATIVE_DAYS[token['relative'].lower()])
+    if token['iso_year']:
+        return datetime(int(token['iso_year']), int(token['iso_month']), int(token['iso_day'])).date()
+
+    if token['num_day']:
+        day, month, year = token['num_day'], int(token['num_month']), token['num_year']
+    elif token['name_month']:
+        day, month, year = token['name_day'], MONTH_ALIASES[token['name_month'].lower()], token['name_year']
+    else:
+        day, month, year = token['day_first'], MONTH_ALIASES[token['month_after'].lower()], token['year_after']
+    if year:
+        year = int(year) + (2000 if len(year) == 2 else 0)
+        return datetime(year, month, int(day)).date()
+    candidate = datetime(today.year, month, int(day)).date()
+    if candidate < today:
+        candidate = datetime(today.year + 1, month, int(day)).date()
+    return candidate
+
+
+def parse_event_time(text, reference=None):
+    """
+    Return ``(starts_at, ends_at)`` aware datetimes for an event's date/time text, or
+    ``(None, None)`` when no date or time can be read. Relative values ("Fri", "Dec 25")
+    resolve to the first matching day on or after ``reference`` (default: now);
+    ``ends_at`` is only known when the text gives a time range.
+    """
+    zone = local_zone()
+    today = timezone.localtime(reference or timezone.now(), zone).date()
+    text = str(text or '').strip()
+
+    moment = parse_datetime(text)
+    if moment is not None:
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment, zone)
+        return moment, None
+
+    date_token = EVENT_DATE.search(text)
+    day = None
+    if date_token:
+        try:
+            day = _event_date(date_token, today)
+        except ValueError:
+            return None, None
+        # Keep the date's digits from being read as a clock time
+        text = text[:date_token.start()] + ' ' + text[date_token.end():]
+
+    starts = ends = None
+    for token in EVENT_TIME.finditer(text):
+        if not (token['start_m'] or token['hour_mark'] or token['start_ampm'] or token['end_h']):
+            continue
+        try:
+            starts = _clock(token['start_h'], token['start_m'], token['start_ampm'] or token['end_ampm'])
+            if token['end_h']:
+                ends = _clock(token['end_h'], token['end_m'], token['end_ampm'])
+        except ValueError:
+            starts = ends = None
+            continue
+        break
+
+    if day is None and starts is None:
+        return None, None
+    day = day or today
+    starts_at = timezone.make_aware(datetime.combine(day, starts or time.min), zone)
+    ends_at = None
+    if ends is not None:
+        ends_at = timezone.make_aware(datetime.combine(day, ends), zone)
+        if ends_at <= starts_at:
+            ends_at += timedelta(days=1)
+    return starts_at, ends_at
@@ -0,0 +1,161 @@
+"""
+Full-text search over the translated content models.
+
+Each Listing, Event, Promotion and Blog has a SearchEntry holding its English and
+Macedonian text. PostgreSQL matches it through a generated tsvector column with a
+GIN index, SQLite through an FTS5 shadow table kept in sync by triggers (see
+migration 0034). Other backends fall back to ``icontains``.
+"""
+import re
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.db.models import BooleanField, Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+from .models import Listing, Event, Promotion, Blog, SearchEntry
+
+SEARCH_TYPES = {
+    'listing': Listing,
+    'event': Event,
+    'promotion': Promotion,
+    'blog': Blog,
+}
+
+FTS_TABLE = 'core_searchentry_fts'
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+
+def _join(*values):
+    """Flatten strings and tag lists into newline separated text, skipping blanks and repeats."""
+    parts = []
+    for value in values:
+        items = value if isinstance(value, (list, tuple)) else [value]
+        for item in items:
+            text = str(item).strip() if item else ''
+            if text and text not in parts:
+                parts.append(text)
+    return '\n'.join(parts)
+
+
+def search_document(instance):
+    """Return the ``(title, body)`` text indexed for a content object."""
+    title = _join(instance.title, instance.title_en, instance.title_mk)
+    if isinstance(instance, Listing):
+        body = _join(
+            instance.description_en, instance.description_mk,
+            instance.address_en, instance.address_mk,
+            instance.tags, instance.tags_mk,
+        )
+    elif isinstance(instance, Event):
+        body = _join(
+            instance.description_en, instance.description_mk,
+            instance.location_en, instance.location_mk,
+        )
+    elif isinstance(instance, Promotion):
+        body = _join(
+            instance.description_en, instance.description_mk,
+            instance.address_en, instance.address_mk,
+            instance.tags, instance.tags_mk,
+        )
+    else:
+        body = _join(
+            instance.subtitle_en, instance.subtitle_mk,
+            instance.content_en, instance.content_mk,
+            instance.author_en, instance.author_mk,
+            instance.tags,
+        )
+    return title, body
+
+
+def index_object(instance):
+    """Create or refresh the search entry of a content object."""
+    if isinstance(instance, Blog) and not instance.published:
+        remove_object(instance)
+        return
+    title, body = search_document(instance)
+    SearchEntry.objects.update_or_create(
+        content_type=ContentType.objects.get_for_model(instance),
+        object_id=instance.pk,
+        defaults={'title': title, 'body': body},
+    )
+
+
+def remove_object(instance):
+    SearchEntry.objects.filter(
+        content_type=ContentType.objects.get_for_model(instance),
+        object_id=instance.pk,
+    ).delete()
+
+
+def _content_type_ids(types):
+    return [ContentType.objects.get_for_model(SEARCH_TYPES[name]).id for name in types]
+
+
+def _fts_available():
+    return FTS_TABLE in connection.introspection.table_names()
+
+
+def _fts5_query(query):
+    """Turn free text into an FTS5 query: every word must match, as a prefix."""
+    words = re.findall(r'\w+', query)
+    return ' '.join('"{}"*'.format(word.replace('"', '""')) for word in words)
+
+
+def _search_postgres(entries, query):
+    tsquery = "websearch_to_tsquery('simple', %s)"
+    return entries.alias(
+        matches=RawSQL(f"search_vector @@ {tsquery}", [query], output_field=BooleanField())
+    ).filter(matches=True).annotate(
+        rank=RawSQL(f"ts_rank(search_vector, {tsquery})", [query], output_field=FloatField())
+    )
+
+
+def _search_sqlite(content_type_ids, query, limit, offset):
+    match = _fts5_query(query)
+    if not match:
+        return []
+    sql = (
+        f"SELECT e.content_type_id, e.object_id, -bm25({FTS_TABLE}, %s, %s) AS rank "
+        f"FROM {FTS_TABLE} JOIN {SearchEntry._meta.db_table} e ON e.id = {FTS_TABLE}.rowid "
+        f"WHERE {FTS_TABLE} MATCH %s"
+    )
+    params = [TITLE_WEIGHT, BODY_WEIGHT, match]
+    if content_type_ids:
+        sql += f" AND e.content_type_id IN ({', '.join(['%s'] * len(content_type_ids))})"
+        params.extend(content_type_ids)
+    sql += " ORDER BY rank DESC, e.id DESC LIMIT %s OFFSET %s"
+    params.extend([limit, offset])
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _search_fallback(entries, query):
+    return entries.filter(
+        Q(title__icontains=query) | Q(body__icontains=query)
+    ).annotate(
+        rank=Case(When(title__icontains=query, then=Value(2.0)), default=Value(1.0), output_field=FloatField())
+    )
+
+
+def search(query, types=None, limit=20, offset=0):
+    """
+    Return ranked ``(content_type_id, object_id, rank)`` hits for a query,
+    best match first, optionally restricted to some of ``SEARCH_TYPES``.
+    """
+    content_type_ids = _content_type_ids(types or [])
+    if connection.vendor == 'sqlite' and _fts_available():
+        return _search_sqlite(content_type_ids, query, limit, offset)
+
+    entries = SearchEntry.objects.all()
+    if content_type_ids:
+        entries = entries.filter(content_type_id__in=content_type_ids)
+    if connection.vendor == 'postgresql':
+        entries = _search_postgres(entries, query)
+    else:
+        entries = _search_fallback(entries, query)
+    return list(
+        entries.order_by('-rank', '-id').values_list('content_type_id', 'object_id', 'rank')[offset:offset + limit]
+    )
@@ -1,7 +1,11 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
 from django.utils import translation
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from .counters import adjust_save_counts
+from .language import LANGUAGE_CLAIM, get_user_language
 from .models import Item, Category, Listing, Event, Promotion, Blog, EventJoin, Wishlist, UserProfile, UserPermission, GuestUser
 
 class ItemSerializer(serializers.ModelSerializer):
@@ -20,7 +24,77 @@ class CategorySerializer(serializers.ModelSerializer):
         language = self.context.get('language', 'en')
         return getattr(obj, f'name_{language}', obj.name_en or obj.name)
 
-class ListingSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """
+    Honour the ``fields`` and ``expand`` serializer context (from ``?fields=`` and
+    ``?expand=``): only the requested fields are built, so unrequested method fields
+    are never computed, and requested nested relations listed in ``expandable_fields``
+    are rendered as their primary key unless expanded.
+    """
+    expandable_fields = ()
+    
+    def get_fields(self):
+        fields = super().get_fields()
+        requested = self.context.get('fields')
+        if requested is None:
+            return fields
+        expand = self.context.get('expand', ())
+        for name in list(fields):
+            if name not in requested:
+                del fields[name]
+            elif name in self.expandable_fields and name not in expand:
+                fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
+        return fields
+
+# Stored cards are only served while they carry this version; bump it whenever the
+# output of a carded serializer (or the CategorySerializer they embed) changes
+CARD_VERSION = 1
+
+class CardListSerializer(serializers.ListSerializer):
+    """
+    List serializer that serves the pre-rendered per-language card stored on each
+    row (``card_cache``). The child's ``user_flag_fields`` depend on the requesting
+    user, are never stored in a card and are computed at request time. Its
+    ``live_fields`` are counters updated in place with F() expressions, which don't
+    rebuild the card, so they are read from the row itself.
+    Rows without a current card for the requested language, and sparse fieldset
+    requests, fall back to live serialization.
+    """
+    
+    def to_representation(self, data):
+        items = data.all() if isinstance(data, models.manager.BaseManager) else data
+        language = self.context.get('language', 'en')
+        requested = self.context.get('fields')
+        flag_fields = getattr(self.child, 'user_flag_fields', ())
+        live_fields = getattr(self.child, 'live_fields', ())
+        # Query annotations the view asked to expose, e.g. distance_km for "near me"
+        annotations = [
+            field for field in self.context.get('annotations', ())
+            if requested is None or field in requested
+        ]
+        
+        representation = []
+        for item in items:
+            card = None
+            # Sparse fieldsets defer card_cache; reading it would load it row by row
+            if requested is None:
+                cards = item.card_cache or {}
+                if cards.get('version') == CARD_VERSION:
+                    card = cards.get(language)
+            if card is None:
+                card = self.child.to_representation(item)
+            else:
+                card = dict(card)
+                for field in flag_fields:
+                    card[field] = getattr(self.child, f'get_{field}')(item)
+                for field in live_fields:
+                    card[field] = getattr(item, field)
+            for field in annotations:
+                card[field] = getattr(item, field, None)
+            representation.append(card)
+        return representation
+
+class ListingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     title = serializers.SerializerMethodField()
     description = serializers.SerializerMethodField()
     address = serializers.SerializerMethodField()
@@ -33,11 +107,16 @@ class ListingSerializer(serializers.ModelSerializer):
     class Meta:
         model = Listing
         fields = [
-            "id", "title", "description", "address", "open_time", 
+            "id", "title", "description", "address", "latitude", "longitude", "open_time", 
             "category", "tags", "working_hours", "image", "phone_number", 
             "facebook_url", "instagram_url", "website_url", 
-            "featured", "created_at", "updated_at", "can_edit"
+            "featured", "save_count", "created_at", "updated_at", "can_edit"
         ]
+        list_serializer_class = CardListSerializer
+    
+    user_flag_fields = ('can_edit',)
+    expandable_fields = ('category',)
+    live_fields = ('save_count',)
     
     def get_title(self, obj):
         language = self.context.get('language', 'en')
@@ -73,14 +152,49 @@ class ListingSerializer(serializers.ModelSerializer):
         if not request or not request.user.is_authenticated:
             return False
         
-        # Check if user has permission to edit this specific listing
-        return UserPermission.objects.filter(
+        # Load the user's editable listing ids once and share them through the
+        # serializer context, so lists and nested serializers don't query per row
+        editable_ids = self.context.get('editable_listing_ids')
+        if editable_ids is None:
+            editable_ids = set(UserPermission.objects.filter(
+                user=request.user,
+                can_edit=True
+            ).values_list('listing_id', flat=True))
+            self.context['editable_listing_ids'] = editable_ids
+        return obj.id in editable_ids
+
+def prime_joined_events(context, event_ids):
+    """
+    Resolve ``has_joined`` for a batch of events with a single query.
+    The answers are stored on the serializer context as ``{event_id: bool}``
+    so EventSerializer can read them instead of querying per event.
+    """
+    joined_events = context.setdefault('joined_events', {})
+    pending = [event_id for event_id in event_ids if event_id not in joined_events]
+    if not pending:
+        return joined_events
+    
+    request = context.get('request')
+    joined_ids = set()
+    if request and request.user.is_authenticated:
+        joined_ids = set(EventJoin.objects.filter(
             user=request.user,
-            listing=obj,
-            can_edit=True
-        ).exists()
+            event_id__in=pending
+        ).values_list('event_id', flat=True))
+    for event_id in pending:
+        joined_events[event_id] = event_id in joined_ids
+    return joined_events
 
-class EventSerializer(serializers.ModelSerializer):
+class EventListSerializer(CardListSerializer):
+    """List serializer that resolves ``has_joined`` for the whole page up front."""
+    
+    def to_representation(self, data):
+        events = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        if 'has_joined' in self.child.fields:
+            prime_joined_events(self.context, [event.id for event in events])
+        return super().to_representation(events)
+
+class EventSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     has_joined = serializers.SerializerMethodField()
     title = serializers.SerializerMethodField()
     description = serializers.SerializerMethodField()
@@ -93,17 +207,26 @@ class EventSerializer(serializers.ModelSerializer):
     class Meta:
         model = Event
         fields = [
-            "id", "title", "description", "date_time", "location", 
+            "id", "title", "description", "date_time", "starts_at", "ends_at", "location", "latitude", "longitude", 
             "cover_image", "entry_price", "category", "age_limit", "expectations", 
-            "join_count", "has_joined", "featured", "created_at", "updated_at"
+            "join_count", "save_count", "has_joined", "featured", "created_at", "updated_at"
         ]
+        list_serializer_class = EventListSerializer
+    
+    user_flag_fields = ('has_joined',)
+    expandable_fields = ('category',)
+    live_fields = ('join_count', 'save_count')
     
     def get_has_joined(self, obj):
         """Check if the current user has joined this event."""
         request = self.context.get('request')
         if not request or not request.user.is_authenticated:
             return False
-        from .models import EventJoin
+        
+        # Use the answer resolved in bulk for the page (or by the view) if present
+        joined_events = self.context.get('joined_events', {})
+        if obj.id in joined_events:
+            return joined_events[obj.id]
         return EventJoin.objects.filter(event=obj, user=request.user).exists()
     
     def get_title(self, obj):
@@ -136,7 +259,7 @@ class EventSerializer(serializers.ModelSerializer):
             return obj.expectations_mk
         return obj.expectations
 
-class PromotionSerializer(serializers.ModelSerializer):
+class PromotionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     title = serializers.SerializerMethodField()
     description = serializers.SerializerMethodField()
     address = serializers.SerializerMethodField()
@@ -147,8 +270,11 @@ class PromotionSerializer(serializers.ModelSerializer):
         fields = [
             "id", "title", "description", "has_discount_code", "discount_code", "tags", 
             "image", "valid_until", "featured", "website", "phone_number", "facebook_url", 
-            "instagram_url", "address", "created_at", "updated_at"
+            "instagram_url", "address", "latitude", "longitude", "save_count", "created_at", "updated_at"
         ]
+        list_serializer_class = CardListSerializer
+    
+    live_fields = ('save_count',)
     
     def get_title(self, obj):
         language = self.context.get('language', 'en')
@@ -168,7 +294,7 @@ class PromotionSerializer(serializers.ModelSerializer):
             return obj.tags_mk
         return obj.tags
 
-class BlogSerializer(serializers.ModelSerializer):
+class BlogSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     title = serializers.SerializerMethodField()
     subtitle = serializers.SerializerMethodField()
     content = serializers.SerializerMethodField()
@@ -181,6 +307,7 @@ class BlogSerializer(serializers.ModelSerializer):
             "tags", "cover_image", "read_time_minutes", "featured", 
             "published", "created_at", "updated_at"
         ]
+        list_serializer_class = CardListSerializer
     
     def get_title(self, obj):
         language = self.context.get('language', 'en')
@@ -198,6 +325,27 @@ class BlogSerializer(serializers.ModelSerializer):
         language = self.context.get('language', 'en')
         return getattr(obj, f'author_{language}', obj.author_en or obj.author)
 
+class BlogSummarySerializer(BlogSerializer):
+    """Blog card for lists: a stored excerpt instead of the full content, which only the detail endpoint returns."""
+    content = None
+    excerpt = serializers.SerializerMethodField()
+    
+    class Meta(BlogSerializer.Meta):
+        fields = [
+            "id", "title", "subtitle", "excerpt", "author", "category", 
+            "tags", "cover_image", "read_time_minutes", "featured", 
+            "published", "created_at", "updated_at"
+        ]
+    
+    # Columns the summary never reads
+    deferred_fields = ('content', 'content_en', 'content_mk')
+    
+    def get_excerpt(self, obj):
+        language = self.context.get('language', 'en')
+        if language == 'mk' and obj.excerpt_mk:
+            return obj.excerpt_mk
+        return obj.excerpt
+
 class GuestUserSerializer(serializers.ModelSerializer):
     class Meta:
         model = GuestUser
@@ -227,6 +375,24 @@ class UserSerializer(serializers.ModelSerializer):
         UserProfile.objects.create(user=user)
         return user
 
+class LanguageTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Embed the user's language preference in issued tokens so requests don't need a profile lookup."""
+    
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[LANGUAGE_CLAIM] = get_user_language(user)
+        return token
+
+class WishlistListSerializer(serializers.ListSerializer):
+    """List serializer that resolves per-user flags for every wishlisted event up front."""
+    
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        event_ids = [item.object_id for item in items if item.content_type.model == 'event']
+        prime_joined_events(self.context, event_ids)
+        return super().to_representation(items)
+
 class WishlistSerializer(serializers.ModelSerializer):
     item_type = serializers.CharField(read_only=True)
     item_data = serializers.SerializerMethodField()
@@ -235,18 +401,21 @@ class WishlistSerializer(serializers.ModelSerializer):
         model = Wishlist
         fields = ["id", "item_type", "item_data", "created_at"]
         read_only_fields = ["user", "created_at"]
+        list_serializer_class = WishlistListSerializer
     
     def get_item_data(self, obj):
         """Serialize the actual content object based on its type."""
+        # Share the context so language and the bulk-resolved user flags reach
+        # the nested serializers
         content_object = obj.content_object
         if isinstance(content_object, Listing):
-            return ListingSerializer(content_object).data
+            return ListingSerializer(content_object, context=self.context).data
         elif isinstance(content_object, Event):
-            return EventSerializer(content_object).data
+            return EventSerializer(content_object, context=self.context).data
         elif isinstance(content_object, Promotion):
-            return PromotionSerializer(content_object).data
+            return PromotionSerializer(content_object, context=self.context).data
         elif isinstance(content_object, Blog):
-            return BlogSerializer(content_object).data
+            return BlogSummarySerializer(content_object, context=self.context).data
         return None
 
 class WishlistCreateSerializer(serializers.Serializer):
@@ -276,12 +445,15 @@ class WishlistCreateSerializer(serializers.Serializer):
         except model_class.DoesNotExist:
             raise serializers.ValidationError(f"{item_type.capitalize()} with id {item_id} does not exist.")
         
-        # Create or get the wishlist item
-        wishlist_item, created = Wishlist.objects.get_or_create(
-            user=user,
-            content_type=content_type,
-            object_id=item_id,
-        )
+        # Create or get the wishlist item, counting the save in the same transaction
+        with transaction.atomic():
+            wishlist_item, created = Wishlist.objects.get_or_create(
+                user=user,
+                content_type=content_type,
+                object_id=item_id,
+            )
+            if created:
+                adjust_save_counts(model_class, [item_id], 1)
         
         if not created:
             raise serializers.ValidationError("Item is already in wishlist.")
@@ -289,6 +461,19 @@ class WishlistCreateSerializer(serializers.Serializer):
         return wishlist_item
 
 
+class WishlistOperationSerializer(serializers.Serializer):
+    """A single offline wishlist edit replayed by the sync endpoint."""
+    op = serializers.ChoiceField(choices=['add', 'remove'])
+    item_type = serializers.ChoiceField(choices=['listing', 'event', 'promotion', 'blog'])
+    item_id = serializers.IntegerField(min_value=1)
+
+
+class WishlistSyncSerializer(serializers.Serializer):
+    """Serializer for the batched offline wishlist edits, in the order they were made."""
+    since = serializers.CharField(required=False, help_text="The token returned by the device's previous sync")
+    operations = WishlistOperationSerializer(many=True, max_length=500)
+
+
 class UserPermissionSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     listing = ListingSerializer(read_only=True)
@@ -0,0 +1,132 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from .caching import bump_content_version
+from .cards import CARD_SERIALIZERS, refresh_cards, refresh_category_cards
+from .excerpts import make_excerpt
+from .fuzzy import FUZZY_TYPES, index_fuzzy, remove_fuzzy
+from .geo import geo_cell
+from .language import remember_guest_language, remember_user_language
+from .models import Category, Listing, Event, Promotion, Blog, GuestUser, OpeningInterval, Tombstone, UserProfile
+from .schedule import listing_opening_intervals, parse_event_time
+from .search import index_object, remove_object
+from .tags import TAGGED_TYPES, index_tags, remove_tags
+
+
+def assign_geo_cell(sender, instance, **kwargs):
+    instance.geo_cell = geo_cell(instance.latitude, instance.longitude)
+
+
+def assign_blog_excerpts(sender, instance, **kwargs):
+    instance.excerpt = make_excerpt(instance.content_en or instance.content)
+    instance.excerpt_mk = make_excerpt(instance.content_mk)
+
+
+def assign_event_times(sender, instance, raw=False, **kwargs):
+    """Re-read the structured start/end times whenever the free-form date_time text changes."""
+    if raw:
+        return
+    if instance.pk and instance.starts_at:
+        previous = Event.objects.filter(pk=instance.pk).values_list('date_time', flat=True).first()
+        if previous == instance.date_time:
+            return
+    # Text that no longer parses (e.g. "TBA") clears the times it replaced
+    instance.starts_at, instance.ends_at = parse_event_time(instance.date_time)
+
+
+def content_saved(sender, instance, raw=False, **kwargs):
+    """Keep the derived per-row data of a content object in sync after it is saved."""
+    if raw:
+        return
+    refresh_cards(instance)
+    index_object(instance)
+    if sender in FUZZY_TYPES.values():
+        index_fuzzy(instance)
+    if sender in TAGGED_TYPES.values():
+        index_tags(instance)
+    if sender is Listing:
+        sync_opening_intervals(instance)
+
+
+def sync_opening_intervals(listing):
+    """Recompile the opening intervals of a listing when its working hours changed."""
+    intervals = listing_opening_intervals(listing)
+    current = list(listing.opening_intervals.order_by('opens_at').values_list('opens_at', 'closes_at'))
+    if current == intervals:
+        return
+    listing.opening_intervals.all().delete()
+    OpeningInterval.objects.bulk_create([
+        OpeningInterval(listing=listing, opens_at=opens_at, closes_at=closes_at)
+        for opens_at, closes_at in intervals
+    ])
+
+
+def content_deleted(sender, instance, **kwargs):
+    """Drop the derived rows that only reference a content object generically."""
+    remove_object(instance)
+    if sender in FUZZY_TYPES.values():
+        remove_fuzzy(instance)
+    if sender in TAGGED_TYPES.values():
+        remove_tags(instance)
+
+
+def record_tombstone(sender, instance, **kwargs):
+    """Remember deletions for clients syncing changes since a point in time."""
+    Tombstone.objects.create(content_type=ContentType.objects.get_for_model(sender), object_id=instance.pk)
+
+
+def content_changed(sender, **kwargs):
+    """Invalidate every cached payload built from content or categories."""
+    bump_content_version()
+
+
+for model in (Listing, Event, Promotion):
+    pre_save.connect(assign_geo_cell, sender=model, dispatch_uid=f'assign_geo_cell_{model.__name__}')
+
+pre_save.connect(assign_event_times, sender=Event, dispatch_uid='assign_event_times')
+pre_save.connect(assign_blog_excerpts, sender=Blog, dispatch_uid='assign_blog_excerpts')
+
+for model in CARD_SERIALIZERS:
+    post_save.connect(content_saved, sender=model, dispatch_uid=f'content_saved_{model.__name__}')
+    post_delete.connect(content_deleted, sender=model, dispatch_uid=f'content_deleted_{model.__name__}')
+
+for model in (*CARD_SERIALIZERS, Category):
+    post_save.connect(content_changed, sender=model, dispatch_uid=f'version_saved_{model.__name__}')
+    post_delete.connect(content_changed, sender=model, dispatch_uid=f'version_deleted_{model.__name__}')
+    post_delete.connect(record_tombstone, sender=model, dispatch_uid=f'tombstone_{model.__name__}')
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, raw=False, created=False, **kwargs):
+    """Category names are embedded in listing and event cards."""
+    if raw or created:
+        return
+    refresh_category_cards([instance.pk])
+
+
+@receiver(pre_delete, sender=Category)
+def category_deleting(sender, instance, **kwargs):
+    # Remember the dependants before on_delete=SET_NULL detaches them
+    instance._dependent_ids = {
+        model: list(model.objects.filter(category=instance).values_list('id', flat=True))
+        for model in (Listing, Event)
+    }
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    for model, ids in getattr(instance, '_dependent_ids', {}).items():
+        for dependent in model.objects.filter(id__in=ids):
+            refresh_cards(dependent, touch=True)
+
+
+@receiver(post_save, sender=UserProfile)
+def user_profile_saved(sender, instance, **kwargs):
+    """The profile is authoritative for the content language, including admin edits."""
+    remember_user_language(instance.user_id, instance.language_preference)
+
+
+@receiver(post_save, sender=GuestUser)
+def guest_user_saved(sender, instance, **kwargs):
+    remember_guest_language(instance.guest_id, instance.language_preference)
@@ -0,0 +1,117 @@
+"""
+Normalized tag index for listings, promotions and blogs.
+
+The ``tags``/``tags_mk`` JSON lists stay the source of truth; on save every tag is
+slugified into a shared ``Tag`` row and linked to the object through an indexed
+``TagAssignment``, so tag filters and tag clouds are index lookups instead of
+JSON scans over every row.
+"""
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Exists, OuterRef
+from django.utils.text import slugify
+
+from .models import Listing, Promotion, Blog, Tag, TagAssignment
+
+TAGGED_TYPES = {
+    'listing': Listing,
+    'promotion': Promotion,
+    'blog': Blog,
+}
+
+# Language -> JSON field holding the tags in that language
+TAG_FIELDS = {
+    'en': 'tags',
+    'mk': 'tags_mk',
+}
+
+MAX_TAG_LENGTH = 100
+
+
+def tag_slug(name):
+    return slugify(str(name), allow_unicode=True)[:MAX_TAG_LENGTH]
+
+
+def object_tags(instance):
+    """Return ``{(slug, language): display name}`` for the tags of an object."""
+    tags = {}
+    for language, field in TAG_FIELDS.items():
+        values = getattr(instance, field, None)
+        if not isinstance(values, list):
+            continue
+        for value in values:
+            slug = tag_slug(value)
+            if slug:
+                tags.setdefault((slug, language), str(value).strip()[:MAX_TAG_LENGTH])
+    return tags
+
+
+def index_tags(instance):
+    """Bring the tag assignments of an object up to date, touching only those that changed."""
+    if isinstance(instance, Blog) and not instance.published:
+        # Unpublished posts don't count towards tag clouds
+        remove_tags(instance)
+        return
+    content_type = ContentType.objects.get_for_model(instance)
+    existing = {
+        (slug, language): assignment_id
+        for assignment_id, slug, language in TagAssignment.objects.filter(
+            content_type=content_type, object_id=instance.pk
+        ).values_list('id', 'tag__slug', 'language')
+    }
+    wanted = object_tags(instance)
+
+    stale_ids = [assignment_id for key, assignment_id in existing.items() if key not in wanted]
+    if stale_ids:
+        TagAssignment.objects.filter(id__in=stale_ids).delete()
+
+    missing = {key: name for key, name in wanted.items() if key not in existing}
+    if not missing:
+        return
+    Tag.objects.bulk_create(
+        [Tag(slug=slug, name=name) for (slug, _language), name in missing.items()],
+        ignore_conflicts=True,
+    )
+    tag_ids = dict(Tag.objects.filter(slug__in={slug for slug, _language in missing}).values_list('slug', 'id'))
+    TagAssignment.objects.bulk_create([
+        TagAssignment(tag_id=tag_ids[slug], content_type=content_type, object_id=instance.pk, language=language)
+        for slug, language in missing
+    ], ignore_conflicts=True)
+
+
+def remove_tags(instance):
+    TagAssignment.objects.filter(
+        content_type=ContentType.objects.get_for_model(instance),
+        object_id=instance.pk,
+    ).delete()
+
+
+def filter_by_tags(queryset, slugs, match_all=False):
+    """Keep the rows tagged with any (or, with ``match_all``, every) of the tag slugs."""
+    assignments = TagAssignment.objects.filter(
+        content_type=ContentType.objects.get_for_model(queryset.model),
+        tag__slug__in=slugs,
+    )
+    if not match_all:
+        return queryset.filter(Exists(assignments.filter(object_id=OuterRef('pk'))))
+    # One grouped subquery: objects carrying as many distinct matching tags as were asked for
+    tagged = assignments.order_by().values('object_id').annotate(
+        matched=Count('tag', distinct=True)
+    ).filter(matched=len(set(slugs))).values('object_id')
+    return queryset.filter(pk__in=tagged)
+
+
+def tag_counts(language, types=None, limit=50):
+    """Return the most used tags of a language as ``[{'slug', 'name', 'count'}]``, most used first."""
+    # One assignment per (tag, object, language), so counting rows counts objects
+    assignments = TagAssignment.objects.filter(language=language)
+    if types:
+        assignments = assignments.filter(content_type__in=[
+            ContentType.objects.get_for_model(TAGGED_TYPES[name]) for name in types
+        ])
+    counts = assignments.values('tag__slug', 'tag__name').annotate(
+        count=Count('id')
+    ).order_by('-count', 'tag__slug')[:limit]
+    return [
+        {'slug': row['tag__slug'], 'name': row['tag__name'], 'count': row['count']}
+        for row in counts
+    ]
@@ -1,3 +1,629 @@
-from django.test import TestCase
+from datetime import datetime, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .language import LANGUAGE_CLAIM
+from .middleware import next_content_change
+from .models import Blog, Category, Event, EventJoin, Listing, Promotion, UserPermission, UserProfile, Wishlist
+from .schedule import local_zone, parse_event_time, parse_working_hours
+from .serializers import ListingSerializer
+from .trending import compute_trending
+from .views import WishlistViewSet
+
+
+def create_listing(**fields):
+    fields = {
+        'title': 'Listing', 'address': 'Address', 'open_time': '08:00 - 16:00',
+        'image': 'https://example.com/listing.jpg', **fields,
+    }
+    return Listing.objects.create(**fields)
+
+
+def create_event(**fields):
+    fields = {
+        'title': 'Event', 'date_time': 'Fri, 20:00', 'location': 'Square',
+        'cover_image': 'https://example.com/event.jpg', **fields,
+    }
+    return Event.objects.create(**fields)
+
+
+def create_promotion(**fields):
+    return Promotion.objects.create(**{'title': 'Promotion', 'image': 'https://example.com/promotion.jpg', **fields})
+
+
+def create_blog(**fields):
+    fields = {
+        'title': 'Blog', 'content': 'Lorem ipsum dolor sit amet.', 'cover_image': 'https://example.com/blog.jpg',
+        **fields,
+    }
+    return Blog.objects.create(**fields)
+
+
+class CardListSerializerTests(TestCase):
+    def test_cards_from_another_version_are_not_served(self):
+        listing = create_listing(category=Category.objects.create(name='Food', icon='food'))
+        Listing.objects.filter(pk=listing.pk).update(card_cache={'en': {'id': listing.pk, 'title': 'Stale'}})
+
+        data = ListingSerializer(Listing.objects.all(), many=True, context={'language': 'en'}).data
+
+        self.assertEqual(data[0]['title'], 'Listing')
+        self.assertIn('latitude', data[0])
+
+
+class LanguageResolutionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('reader', password='secret-password')
+        self.profile = UserProfile.objects.create(user=self.user, language_preference='mk')
+        create_listing(title_en='Bakery', title_mk='Пекара')
+        # Issued while the preference was still Macedonian
+        token = RefreshToken.for_user(self.user)
+        token[LANGUAGE_CLAIM] = 'mk'
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+
+    def listing_title(self):
+        return self.client.get('/api/listings/').json()[0]['title']
+
+    def test_changed_preference_beats_older_token_claim_after_cache_loss(self):
+        self.client.post('/api/auth/language/', {'language': 'en'}, format='json')
+        cache.clear()
+
+        self.assertEqual(self.listing_title(), 'Bakery')
+
+    def test_profile_edits_outside_the_api_are_seen(self):
+        self.assertEqual(self.listing_title(), 'Пекара')
+
+        self.profile.language_preference = 'en'
+        self.profile.save()
+
+        self.assertEqual(self.listing_title(), 'Bakery')
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Food', icon='food')
+        self.listing = create_listing(category=self.category)
+
+    def test_malformed_lookup_is_not_found(self):
+        for path in ('/api/listings/abc/', '/api/events/abc/'):
+            self.assertEqual(self.client.get(path).status_code, 404)
+
+    def test_responses_vary_on_every_language_input(self):
+        vary = {value.strip() for value in self.client.get('/api/listings/')['Vary'].split(',')}
+        self.assertLessEqual({'Authorization', 'Accept-Language', 'X-Guest-Id'}, vary)
+
+    def test_category_changes_invalidate_the_list_etag(self):
+        etag = self.client.get('/api/listings/')['ETag']
+
+        self.category.name = 'Restaurants'
+        self.category.save()
+        response = self.client.get('/api/listings/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['category']['name'], 'Restaurants')
+
+        self.category.delete()
+        response = self.client.get('/api/listings/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.json()[0]['category'])
+
+
+class OpenNowFilterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        create_listing(title='Always', working_hours={'daily': '24/7'})
+        create_listing(title='Never', working_hours={'daily': 'closed'})
+
+    def titles(self, query):
+        return sorted(listing['title'] for listing in self.client.get(f'/api/listings/?{query}').json())
+
+    def test_open_now_is_parsed_as_a_boolean(self):
+        self.assertEqual(self.titles('open_now=1'), ['Always'])
+        self.assertEqual(self.titles('open_now=true'), ['Always'])
+        self.assertEqual(self.titles('open_now=0'), ['Always', 'Never'])
+        self.assertEqual(self.titles('open_now=false'), ['Always', 'Never'])
+        self.assertEqual(self.client.get('/api/listings/?open_now=maybe').status_code, 400)
+
+
+def week_minute(day, hours, minutes=0):
+    return day * 24 * 60 + hours * 60 + minutes
+
+
+def every_day(opens, closes, days=range(7)):
+    return [(week_minute(day, *opens), week_minute(day, *closes)) for day in days]
+
+
+class WorkingHoursParserTests(TestCase):
+    CASES = [
+        ({'monday': '09:00-18:00'}, every_day((9,), (18,), [0])),
+        ({'Mon-Fri': '9-17', 'Sat': 'closed'}, every_day((9,), (17,), range(5))),
+        ('09:00-18:00', every_day((9,), (18,))),
+        ({'пон-пет': '08-16'}, every_day((8,), (16,), range(5))),
+        ({'weekdays': {'open': '10:00', 'close': '22:00'}}, every_day((10,), (22,), range(5))),
+        ({'Sun': 'затворено'}, []),
+        ('24/7', [(0, week_minute(7, 0))]),
+        ({'Fri': '22:00-02:00'}, [(week_minute(4, 22), week_minute(5, 2))]),
+        ({'Sun': '20:00-02:00'}, [(0, week_minute(0, 2)), (week_minute(6, 20), week_minute(7, 0))]),
+        ({'daily': '9am-5pm'}, every_day((9,), (17,))),
+        ({'Mon': '9:30 AM - 6 PM'}, every_day((9, 30), (18,), [0])),
+        ({'Sat': '1-5pm'}, every_day((13,), (17,), [5])),
+        ({'Sat': '9-5pm'}, every_day((9,), (17,), [5])),
+        ({'Fri': '8pm-2am'}, [(week_minute(4, 20), week_minute(5, 2))]),
+        ({'Mon': '13pm-5pm'}, []),
+        ('by appointment', []),
+    ]
+
+    def test_formats(self):
+        for value, expected in self.CASES:
+            with self.subTest(value=value):
+                self.assertEqual(parse_working_hours(value), expected)
+
+
+class EventTimeParserTests(TestCase):
+    def local(self, *args):
+        return datetime(*args, tzinfo=local_zone())
+
+    def test_formats(self):
+        # A Wednesday
+        reference = self.local(2026, 10, 14, 12, 0)
+        cases = [
+            ('Fri, 20:00', self.local(2026, 10, 16, 20, 0), None),
+            ('Dec 25, 18:00', self.local(2026, 12, 25, 18, 0), None),
+            ('25.12.2026 20:00-23:00', self.local(2026, 12, 25, 20, 0), self.local(2026, 12, 25, 23, 0)),
+            ('2026-11-01T19:30', self.local(2026, 11, 1, 19, 30), None),
+            ('Tonight 21h', self.local(2026, 10, 14, 21, 0), None),
+            ('утре 20:00', self.local(2026, 10, 15, 20, 0), None),
+            ('Sat 9pm-1am', self.local(2026, 10, 17, 21, 0), self.local(2026, 10, 18, 1, 0)),
+            ('8pm', self.local(2026, 10, 14, 20, 0), None),
+            ('5 Nov', self.local(2026, 11, 5, 0, 0), None),
+            ('Oct 1, 19:00', self.local(2027, 10, 1, 19, 0), None),
+            ('TBA', None, None),
+            ('', None, None),
+        ]
+        for text, starts_at, ends_at in cases:
+            with self.subTest(text=text):
+                self.assertEqual(parse_event_time(text, reference), (starts_at, ends_at))
+
+    def test_unparseable_text_clears_the_previous_times(self):
+        event = Event.objects.create(
+            title='Concert', date_time='25.12.2026 20:00-23:00', location='Square',
+            cover_image='https://example.com/event.jpg',
+        )
+        self.assertIsNotNone(event.starts_at)
+
+        event.date_time = 'TBA'
+        event.save()
+        event.refresh_from_db()
+
+        self.assertIsNone(event.starts_at)
+        self.assertIsNone(event.ends_at)
+
+
+class UpcomingFilterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for title, date_time in (('Past', '2020-01-01T20:00'), ('Future', '2099-01-01T20:00')):
+            Event.objects.create(
+                title=title, date_time=date_time, location='Square', cover_image='https://example.com/event.jpg',
+            )
+
+    def titles(self, query):
+        return sorted(event['title'] for event in self.client.get(f'/api/events/?{query}').json())
+
+    def test_upcoming_is_parsed_as_a_boolean(self):
+        self.assertEqual(self.titles('upcoming=1'), ['Future'])
+        self.assertEqual(self.titles('upcoming=0'), ['Future', 'Past'])
+        self.assertEqual(self.titles('upcoming=false'), ['Future', 'Past'])
+
+
+class PromotionListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for title, valid_until in (('Expired', '2020-01-01'), ('Active', None)):
+            Promotion.objects.create(title=title, image='https://example.com/promotion.jpg', valid_until=valid_until)
+
+    def titles(self, query):
+        return sorted(promotion['title'] for promotion in self.client.get(f'/api/promotions/?{query}').json())
+
+    def test_include_expired_is_parsed_as_a_boolean(self):
+        self.assertEqual(self.titles(''), ['Active'])
+        self.assertEqual(self.titles('include_expired=0'), ['Active'])
+        self.assertEqual(self.titles('include_expired=1'), ['Active', 'Expired'])
+
+
+class WishlistTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('saver', password='secret-password')
+        self.listing = create_listing()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_check_batch_rejects_non_integral_ids(self):
+        response = self.client.post('/api/wishlist/check-batch/', {
+            'items': [{'item_type': 'listing', 'item_id': 1.7}],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post('/api/wishlist/check-batch/', {
+            'items': [{'item_type': 'listing', 'item_id': str(self.listing.pk)}],
+        }, format='json')
+        self.assertEqual(response.json(), {'wishlisted': {'listing': {str(self.listing.pk): False}}})
+
+    def save_listing(self):
+        return self.client.post('/api/wishlist/', {'item_type': 'listing', 'item_id': self.listing.pk}, format='json')
+
+    def save_count(self):
+        self.listing.refresh_from_db()
+        return self.listing.save_count
+
+    def test_destroy_decrements_the_save_count(self):
+        item_id = self.save_listing().json()['id']
+        self.assertEqual(self.save_count(), 1)
+
+        self.assertEqual(self.client.delete(f'/api/wishlist/{item_id}/').status_code, 204)
+        self.assertEqual(self.save_count(), 0)
+
+    def test_repeated_removes_decrement_once(self):
+        self.save_listing()
+        # Another user's save keeps the count above zero
+        Wishlist.objects.create(
+            user=User.objects.create_user('other', password='secret-password'),
+            content_type=ContentType.objects.get_for_model(Listing), object_id=self.listing.pk,
+        )
+        Listing.objects.filter(pk=self.listing.pk).update(save_count=2)
+        data = {'item_type': 'listing', 'item_id': self.listing.pk}
+
+        self.assertEqual(self.client.post('/api/wishlist/remove/', data, format='json').status_code, 200)
+        self.assertEqual(self.client.post('/api/wishlist/remove/', data, format='json').status_code, 404)
+        self.assertEqual(self.save_count(), 1)
+
+    def sync(self, operations, since=None):
+        data = {'operations': operations}
+        if since:
+            data['since'] = since
+        return self.client.post('/api/wishlist/sync/', data, format='json')
+
+    def wishlisted_ids(self):
+        return set(Wishlist.objects.filter(user=self.user).values_list('object_id', flat=True))
+
+    def test_sync_removals_spare_items_saved_after_the_previous_sync(self):
+        self.sync([{'op': 'add', 'item_type': 'listing', 'item_id': self.listing.pk}])
+        token = self.sync([]).json()['token']
+        # Saved on another device after this device's last sync
+        other = create_listing(title='Other')
+        Wishlist.objects.create(
+            user=self.user, content_type=ContentType.objects.get_for_model(Listing), object_id=other.pk,
+        )
+
+        response = self.sync([
+            {'op': 'remove', 'item_type': 'listing', 'item_id': self.listing.pk},
+            {'op': 'remove', 'item_type': 'listing', 'item_id': other.pk},
+        ], since=token)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.wishlisted_ids(), {other.pk})
+
+    def test_sync_removals_decrement_each_save_count_once(self):
+        other = create_listing(title='Other')
+        refs = [{'item_type': 'listing', 'item_id': pk} for pk in (self.listing.pk, other.pk)]
+        self.sync([{'op': 'add', **ref} for ref in refs])
+
+        self.sync([{'op': 'remove', **ref} for ref in refs])
+        self.sync([{'op': 'remove', **ref} for ref in refs])
+
+        self.assertEqual(self.wishlisted_ids(), set())
+        self.assertEqual(list(Listing.objects.order_by('pk').values_list('save_count', flat=True)), [0, 0])
+
+    def test_sync_additions_count_only_inserted_rows(self):
+        self.save_listing()
+        # A concurrent save lands between the saved-state check and the insert
+        def stale_state(view, refs):
+            return {ref: False for ref in refs}
+
+        with mock.patch.object(WishlistViewSet, 'wishlist_state', stale_state):
+            response = self.sync([{'op': 'add', 'item_type': 'listing', 'item_id': self.listing.pk}])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.save_count(), 1)
+
+    def test_sync_applies_the_last_edit_per_item(self):
+        self.sync([
+            {'op': 'add', 'item_type': 'listing', 'item_id': self.listing.pk},
+            {'op': 'remove', 'item_type': 'listing', 'item_id': self.listing.pk},
+        ])
+        self.assertEqual(self.wishlisted_ids(), set())
+
+
+class CatalogSyncTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Food', icon='food')
+        self.listing = create_listing(category=self.category)
+        # Move the rows out of the overlap window every sync re-reads
+        for model in (Category, Listing):
+            model.objects.update(updated_at=F('updated_at') - timedelta(minutes=1))
+        self.token = self.client.get('/api/sync/').json()['token']
+
+    def delta(self):
+        return self.client.get('/api/sync/', {'since': self.token}).json()
+
+    def test_category_deletion_resends_its_listings(self):
+        category_id = self.category.pk
+        self.category.delete()
+        delta = self.delta()
+
+        self.assertEqual([listing['id'] for listing in delta['listings']['updated']], [self.listing.pk])
+        self.assertIsNone(delta['listings']['updated'][0]['category'])
+        self.assertEqual(delta['categories']['deleted'], [category_id])
+
+    def test_trending_flag_changes_resend_the_category_listings(self):
+        user = User.objects.create_user('saver', password='secret-password')
+        Wishlist.objects.create(
+            user=user, content_type=ContentType.objects.get_for_model(Listing), object_id=self.listing.pk,
+        )
+        compute_trending()
+        delta = self.delta()
+
+        self.assertEqual([category['id'] for category in delta['categories']['updated']], [self.category.pk])
+        self.assertEqual([listing['id'] for listing in delta['listings']['updated']], [self.listing.pk])
+        self.assertTrue(delta['listings']['updated'][0]['category']['trending'])
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for index in range(3):
+            create_listing(title=f'Listing {index}')
+
+    def next_link(self, **extra):
+        return self.client.get('/api/listings/', {'page_size': 1}, **extra).json()['next']
+
+    def test_cached_pages_link_back_to_the_requested_host(self):
+        self.assertTrue(self.next_link(HTTP_HOST='a.example.com').startswith('http://a.example.com/'))
+        self.assertTrue(self.next_link(HTTP_HOST='b.example.com').startswith('http://b.example.com/'))
+        self.assertTrue(self.next_link(HTTP_HOST='a.example.com', secure=True).startswith('https://a.example.com/'))
+
+    def test_next_content_change(self):
+        # A Wednesday
+        now = datetime(2026, 10, 14, 12, 0, tzinfo=local_zone())
+        self.assertIsNone(next_content_change(now))
+
+        Promotion.objects.create(title='Sale', image='https://example.com/promotion.jpg', valid_until=now.date())
+        self.assertEqual(next_content_change(now), datetime(2026, 10, 15, 0, 0, tzinfo=local_zone()))
+
+        Event.objects.create(
+            title='Concert', date_time='2026-10-14T12:10', location='Square',
+            cover_image='https://example.com/event.jpg',
+        )
+        self.assertEqual(next_content_change(now), datetime(2026, 10, 14, 12, 10, tzinfo=local_zone()))
+
+        create_listing(working_hours={'Wednesday': '12:05-18:00'})
+        self.assertEqual(next_content_change(now), datetime(2026, 10, 14, 12, 5, tzinfo=local_zone()))
+
+
+class ListQueryCountTests(TestCase):
+    """Per-user flags and wishlisted objects are resolved in bulk, not per row."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('reader', password='secret-password')
+        self.category = Category.objects.create(name='Food', icon='food')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def assertFlatQueryCount(self, path, add_rows, initial=2):
+        add_rows(initial)
+        # Warm the per-user caches (e.g. the language preference)
+        self.client.get(path)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(len(self.client.get(path).json()), initial)
+
+        add_rows(12)
+        with self.assertNumQueries(len(queries)):
+            self.assertEqual(len(self.client.get(path).json()), initial + 12)
+
+    def test_listings_with_can_edit(self):
+        def add_rows(count):
+            for _ in range(count):
+                listing = create_listing(category=self.category)
+                UserPermission.objects.create(user=self.user, listing=listing)
+
+        self.assertFlatQueryCount('/api/listings/', add_rows)
+        self.assertTrue(all(listing['can_edit'] for listing in self.client.get('/api/listings/').json()))
+
+    def test_sparse_listings(self):
+        def add_rows(count):
+            for _ in range(count):
+                listing = create_listing(category=self.category)
+                UserPermission.objects.create(user=self.user, listing=listing)
+
+        self.assertFlatQueryCount('/api/listings/?fields=title,can_edit', add_rows)
+
+    def test_events_with_has_joined(self):
+        def add_rows(count):
+            for _ in range(count):
+                EventJoin.objects.create(user=self.user, event=create_event(category=self.category))
+
+        self.assertFlatQueryCount('/api/events/', add_rows)
+        self.assertTrue(all(event['has_joined'] for event in self.client.get('/api/events/').json()))
+
+    def test_wishlist_of_every_content_type(self):
+        creators = [
+            lambda: create_listing(category=self.category), lambda: create_event(category=self.category),
+            create_promotion, create_blog,
+        ]
+
+        def add_rows(count):
+            for index in range(count):
+                content_object = creators[index % len(creators)]()
+                Wishlist.objects.create(user=self.user, content_object=content_object)
+
+        # Start with every type so each per-type query is already counted
+        self.assertFlatQueryCount('/api/wishlist/', add_rows, initial=len(creators))
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def search(self, **params):
+        return self.client.get('/api/search/', params).json()
+
+    def hits(self, **params):
+        return [(hit['type'], hit['item']['title']) for hit in self.search(**params)['results']]
+
+    def test_matches_titles_and_bodies_in_both_languages(self):
+        create_listing(title_en='Riverside Bakery', title_mk='Пекара Крај Реката')
+        create_event(title='Jazz night', description_en='Live music by the river')
+
+        self.assertEqual(self.hits(q='bakery'), [('listing', 'Riverside Bakery')])
+        self.assertEqual(self.hits(q='пекара'), [('listing', 'Riverside Bakery')])
+        # Title matches outrank body matches; words match as prefixes
+        self.assertEqual(self.hits(q='river'), [('listing', 'Riverside Bakery'), ('event', 'Jazz night')])
+
+    def test_index_follows_updates_and_deletes(self):
+        listing = create_listing(title='Old Mill')
+        listing.title = 'New Mill'
+        listing.save()
+
+        self.assertEqual(self.hits(q='old'), [])
+        self.assertEqual(self.hits(q='new mill'), [('listing', 'New Mill')])
+
+        listing.delete()
+        self.assertEqual(self.hits(q='mill'), [])
+
+    def test_unpublished_blogs_are_not_found(self):
+        blog = create_blog(title='Harvest festival', published=False)
+        self.assertEqual(self.hits(q='harvest'), [])
+
+        blog.published = True
+        blog.save()
+        self.assertEqual(self.hits(q='harvest'), [('blog', 'Harvest festival')])
+
+    def test_type_filter(self):
+        create_listing(title='Lake view')
+        create_promotion(title='Lake cruise')
+
+        self.assertEqual(self.hits(q='lake', type='promotion'), [('promotion', 'Lake cruise')])
+        self.assertEqual(len(self.hits(q='lake', type='listing,promotion')), 2)
+        self.assertEqual(self.client.get('/api/search/', {'q': 'lake', 'type': 'user'}).status_code, 400)
+
+    def test_next_offset_pages_through_hits(self):
+        for index in range(5):
+            create_listing(title=f'Market stall {index}')
+
+        first = self.search(q='market', limit=2)
+        second = self.search(q='market', limit=2, offset=first['next_offset'])
+        last = self.search(q='market', limit=2, offset=second['next_offset'])
+
+        self.assertEqual((first['next_offset'], second['next_offset'], last['next_offset']), (2, 4, None))
+        titles = [hit['item']['title'] for page in (first, second, last) for hit in page['results']]
+        self.assertEqual(sorted(titles), [f'Market stall {index}' for index in range(5)])
+
+
+class FuzzySearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.listing = create_listing(title='Hotel Gevgelija', address='Main street')
+        create_listing(title='Dojran Lake Resort', address='Lake road')
+
+    def titles(self, q, **params):
+        response = self.client.get('/api/search/fuzzy/', {'q': q, **params}).json()
+        return [hit['item']['title'] for hit in response['results']]
+
+    def test_matches_across_scripts_and_misspellings(self):
+        for query in ('Gevgelija', 'Гевгелија', 'Gevgelia', 'gevgelija hotel', 'Ǵevgelija'):
+            with self.subTest(query=query):
+                self.assertEqual(self.titles(query), ['Hotel Gevgelija'])
+
+    def test_threshold(self):
+        self.assertEqual(self.titles('Gevgelia', threshold=0.95), [])
+        self.assertEqual(self.titles('Gevgelija', threshold=0.95), ['Hotel Gevgelija'])
+        self.assertEqual(self.titles('Gvglj', threshold=0.3), [])
+
+    def test_title_changes_are_reindexed(self):
+        self.listing.title = 'Hotel Bogorodica'
+        self.listing.save()
+
+        self.assertEqual(self.titles('Gevgelija'), [])
+        self.assertEqual(self.titles('Богородица'), ['Hotel Bogorodica'])
+
+
+class NearbyFilterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for title, latitude in (('Far', 42.2), ('Close', 42.008), ('Middle', 42.028)):
+            create_listing(title=title, latitude=latitude, longitude=21.4254)
+        create_listing(title='Unplaced')
+
+    def get(self, query):
+        return self.client.get(f'/api/listings/?near=41.9981,21.4254&{query}')
+
+    def test_rows_outside_the_radius_are_dropped_nearest_first(self):
+        listings = self.get('').json()
+        self.assertEqual([listing['title'] for listing in listings], ['Close', 'Middle'])
+        self.assertAlmostEqual(listings[0]['distance_km'], 1.1, places=1)
+        self.assertEqual([listing['title'] for listing in self.get('radius=2').json()], ['Close'])
+        self.assertEqual([listing['title'] for listing in self.get('radius=50').json()], ['Close', 'Middle', 'Far'])
+
+    def test_malformed_input_is_rejected(self):
+        for query in ('radius=far', 'radius=nan', 'radius=inf', 'radius=-inf'):
+            response = self.get(query)
+            self.assertEqual(response.status_code, 400, query)
+            self.assertIn('radius', response.json())
+        self.assertEqual(self.client.get('/api/listings/?near=91,0').status_code, 400)
+
+
+class TagTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.grill = create_listing(title='Grill', tags=['Grill', 'Family'], tags_mk=['Скара', 'Семејно'])
+        create_listing(title='Cafe', tags=['Coffee', 'Family'], tags_mk=['Кафе', 'Семејно'])
+        create_promotion(title='Lunch', tags=['Grill'])
+
+    def titles(self, query):
+        return sorted(listing['title'] for listing in self.client.get(f'/api/listings/?{query}').json())
+
+    def test_tag_modes(self):
+        self.assertEqual(self.titles('tag=grill'), ['Grill'])
+        self.assertEqual(self.titles('tag=grill,coffee'), ['Cafe', 'Grill'])
+        self.assertEqual(self.titles('tag=grill&tag=coffee&tag_mode=any'), ['Cafe', 'Grill'])
+        self.assertEqual(self.titles('tag=grill,family&tag_mode=all'), ['Grill'])
+        self.assertEqual(self.titles('tag=grill,coffee&tag_mode=all'), [])
+
+    def test_tags_match_in_either_language(self):
+        self.assertEqual(self.titles('tag=скара'), ['Grill'])
+        self.assertEqual(self.titles('tag=скара,family&tag_mode=all'), ['Grill'])
+
+    def test_removed_tags_stop_matching(self):
+        self.grill.tags = ['Family']
+        self.grill.tags_mk = ['Семејно']
+        self.grill.save()
+
+        self.assertEqual(self.titles('tag=grill'), [])
+        self.assertEqual(self.titles('tag=скара'), [])
+        self.assertEqual(self.titles('tag=family'), ['Cafe', 'Grill'])
+
+    def test_counts(self):
+        counts = self.client.get('/api/tags/').json()
+        self.assertEqual([(tag['slug'], tag['count']) for tag in counts], [('family', 2), ('grill', 2), ('coffee', 1)])
+
+        counts = self.client.get('/api/tags/?type=listing&limit=1').json()
+        self.assertEqual(counts, [{'slug': 'family', 'name': 'Family', 'count': 2}])
+
+        counts = self.client.get('/api/tags/?type=listing', HTTP_ACCEPT_LANGUAGE='mk').json()
+        self.assertEqual([(tag['slug'], tag['count']) for tag in counts], [('семејно', 2), ('кафе', 1), ('скара', 1)])
+
+        self.assertEqual(self.client.get('/api/tags/?type=event').status_code, 400)
@@ -0,0 +1,109 @@
+"""
+Time-decayed popularity ("trending") scores.
+
+Every EventJoin and Wishlist row is an activity worth ``weight * 0.5 ** (age / half-life)``.
+Activity is aggregated in the database into per-object daily counts, so the job reads
+one row per object and day instead of every activity row, and only the decay is
+applied in Python. A category's score is the sum of its listings' and events' scores;
+the top categories get the ``trending`` flag.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .caching import bump_content_version
+from .cards import refresh_category_cards
+from .models import Category, Listing, Event, Promotion, Blog, EventJoin, Wishlist
+
+TRENDING_MODELS = (Listing, Event, Promotion, Blog)
+
+HALF_LIFE_DAYS = 7
+# Activity older than this many half-lives adds less than 1/16 and is ignored
+HORIZON_HALF_LIVES = 4
+JOIN_WEIGHT = 2.0
+SAVE_WEIGHT = 1.0
+TRENDING_CATEGORIES = 3
+
+
+def _decay(day, today, half_life_days):
+    return 0.5 ** ((today - day).days / half_life_days)
+
+
+def activity_scores(half_life_days=HALF_LIFE_DAYS, now=None):
+    """Return ``{model: {object_id: score}}`` for objects with recent activity."""
+    now = now or timezone.now()
+    today = now.date()
+    since = now - timedelta(days=half_life_days * HORIZON_HALF_LIVES)
+    scores = defaultdict(lambda: defaultdict(float))
+
+    joins = EventJoin.objects.filter(created_at__gte=since).annotate(
+        day=TruncDate('created_at')
+    ).order_by().values('event_id', 'day').annotate(activity=Count('id'))
+    for row in joins:
+        scores[Event][row['event_id']] += JOIN_WEIGHT * row['activity'] * _decay(row['day'], today, half_life_days)
+
+    models_by_content_type = {
+        ContentType.objects.get_for_model(model).id: model for model in TRENDING_MODELS
+    }
+    saves = Wishlist.objects.filter(
+        created_at__gte=since, content_type_id__in=models_by_content_type,
+    ).annotate(
+        day=TruncDate('created_at')
+    ).order_by().values('content_type_id', 'object_id', 'day').annotate(activity=Count('id'))
+    for row in saves:
+        model = models_by_content_type[row['content_type_id']]
+        scores[model][row['object_id']] += SAVE_WEIGHT * row['activity'] * _decay(row['day'], today, half_life_days)
+    return scores
+
+
+def _store_scores(model, scores):
+    """Write changed scores without touching updated_at or the cached cards."""
+    changed = []
+    for instance in model.objects.filter(pk__in=scores).only('id', 'trending_score'):
+        score = round(scores[instance.pk], 6)
+        if instance.trending_score != score:
+            instance.trending_score = score
+            changed.append(instance)
+    model.objects.bulk_update(changed, ['trending_score'], batch_size=500)
+    reset = model.objects.exclude(pk__in=scores).exclude(trending_score=0).update(trending_score=0)
+    return len(changed) + reset
+
+
+def compute_trending(half_life_days=HALF_LIFE_DAYS):
+    """Recompute all trending scores and category flags; returns the number of changed rows."""
+    scores = activity_scores(half_life_days)
+    changed = 0
+    with transaction.atomic():
+        for model in TRENDING_MODELS:
+            changed += _store_scores(model, scores.get(model, {}))
+
+        category_scores = defaultdict(float)
+        for model in (Listing, Event):
+            for object_id, category_id in model.objects.filter(
+                pk__in=scores.get(model, {}), category__isnull=False,
+            ).values_list('id', 'category_id'):
+                category_scores[category_id] += scores[model][object_id]
+        changed += _store_scores(Category, category_scores)
+
+        ranked = sorted(
+            (category_id for category_id, score in category_scores.items() if score > 0),
+            key=lambda category_id: -category_scores[category_id],
+        )
+        top = set(ranked[:TRENDING_CATEGORIES])
+        current = set(Category.objects.filter(trending=True).values_list('id', flat=True))
+        if top != current:
+            now = timezone.now()
+            Category.objects.filter(pk__in=current - top).update(trending=False, updated_at=now)
+            Category.objects.filter(pk__in=top - current).update(trending=True, updated_at=now)
+            # Listing and event cards embed their category
+            refresh_category_cards(current ^ top)
+            changed += len(current ^ top)
+
+    if changed:
+        bump_content_version()
+    return changed
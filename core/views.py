@@ -1,100 +1,477 @@
+import math
+from datetime import datetime, time, timedelta
+
 from rest_framework import viewsets, permissions, status
 from rest_framework.views import APIView
 from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import BooleanField, IntegerField
 from rest_framework.response import Response
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.contenttypes.prefetch import GenericPrefetch
 from django.contrib.auth import authenticate
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Exists, F, Min, OuterRef, Q
+from django.http import Http404
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime, parse_time
 from rest_framework_simplejwt.tokens import RefreshToken
-from .models import Item, Category, Listing, Event, Promotion, Blog, EventJoin, Wishlist, UserProfile, UserPermission, GuestUser
-from .serializers import ItemSerializer, CategorySerializer, ListingSerializer, EventSerializer, PromotionSerializer, BlogSerializer, UserSerializer, WishlistSerializer, WishlistCreateSerializer, UserProfileSerializer, UserPermissionSerializer, CreateUserPermissionSerializer, EditListingSerializer, GuestUserSerializer
+from .models import Item, Category, Listing, Event, Promotion, Blog, EventJoin, Wishlist, UserProfile, UserPermission, GuestUser, OpeningInterval
+from .caching import content_cache_key, timeout_until
+from .cards import CARD_SERIALIZERS
+from .conditional import collection_state, conditional_response, make_etag
+from .counters import adjust_save_counts, adjust_wishlist_save_counts
+from .fuzzy import DEFAULT_THRESHOLD, FUZZY_TYPES, fuzzy_search
+from .geo import DEFAULT_RADIUS_KM, MAX_RADIUS_KM, filter_nearby, parse_point
+from .language import LANGUAGE_CLAIM, get_user_language, resolve_language
+from .pagination import OptionalCursorPagination
+from .schedule import end_of_day, local_today, local_zone, minute_of_week
+from .search import SEARCH_TYPES, search
+from .sync import changes_since, decode_token, encode_token
+from .tags import TAGGED_TYPES, filter_by_tags, tag_counts, tag_slug
+from .serializers import ItemSerializer, CategorySerializer, ListingSerializer, EventSerializer, PromotionSerializer, BlogSerializer, BlogSummarySerializer, UserSerializer, WishlistSerializer, WishlistCreateSerializer, WishlistSyncSerializer, UserProfileSerializer, UserPermissionSerializer, CreateUserPermissionSerializer, EditListingSerializer, GuestUserSerializer
 
 class ItemViewSet(viewsets.ModelViewSet):
     queryset = Item.objects.all().order_by("-created_at")
     serializer_class = ItemSerializer
     permission_classes = [permissions.AllowAny]
 
-class CategoryViewSet(viewsets.ModelViewSet):
-    queryset = Category.objects.all()
-    serializer_class = CategorySerializer
-    permission_classes = [permissions.AllowAny]
+def boolean_param(request, name):
+    """Parse a boolean query parameter (``1``/``0``, ``true``/``false``, ...); absent means False."""
+    value = request.query_params.get(name)
+    if not value:
+        return False
+    try:
+        return BooleanField().to_internal_value(value)
+    except ValidationError:
+        raise ValidationError({name: "Expected a boolean (true/false or 1/0)."})
+
+class LanguageContextMixin:
+    """Pass the request's resolved content language to the serializers."""
     
     def get_serializer_context(self):
         context = super().get_serializer_context()
-        # Get language from user profile or default to 'en'
-        language = 'en'
-        if self.request.user.is_authenticated and hasattr(self.request.user, 'profile'):
-            language = self.request.user.profile.language_preference
-        context['language'] = language
+        context['language'] = resolve_language(self.request)
         return context
 
-class ListingViewSet(viewsets.ModelViewSet):
-    queryset = Listing.objects.all()
-    serializer_class = ListingSerializer
+class PaginatedListMixin:
+    """Shared list handling for the public content viewsets."""
+    pagination_class = OptionalCursorPagination
+    
+    def list(self, request, *args, **kwargs):
+        return self.list_response(self.filter_queryset(self.get_queryset()))
+    
+    def get_cursor_ordering(self):
+        """Ordering lists and their cursors key on, or None for the default (-created_at, id)."""
+        return None
+    
+    def list_response(self, queryset):
+        """Serialize a queryset, paginating it when the client asked for a page."""
+        ordering = self.get_cursor_ordering()
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+class ConditionalGetMixin:
+    """
+    Answer list, featured and detail GETs with 304 Not Modified when the client's
+    ETag still matches, without serializing anything.
+    """
+    # Counter columns updated in place without bumping updated_at
+    counter_fields = ()
+    
+    def get_user_flag_state(self):
+        """Return a value that changes whenever the caller's per-user flags change."""
+        return ''
+    
+    def get_filter_state(self):
+        """Return a value that changes whenever a time-dependent filter selects other rows."""
+        return ''
+    
+    def get_validators(self, queryset):
+        count, last_modified, *counters = collection_state(queryset, counter_fields=self.counter_fields)
+        etag = make_etag(
+            self.basename, self.request.get_full_path(), resolve_language(self.request),
+            count, last_modified, *counters, self.get_user_flag_state(), self.get_filter_state(),
+        )
+        return etag, last_modified
+    
+    def list_response(self, queryset):
+        etag, last_modified = self.get_validators(queryset)
+        return conditional_response(
+            self.request, etag, last_modified,
+            lambda: super(ConditionalGetMixin, self).list_response(queryset),
+            honor_last_modified=False,
+        )
+    
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: kwargs[lookup_url_kwarg]}
+            )
+        except (TypeError, ValueError, DjangoValidationError):
+            # Malformed lookups are a 404, as in get_object()
+            raise Http404
+        etag, last_modified = self.get_validators(queryset)
+        return conditional_response(
+            request, etag, last_modified,
+            lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+        )
+
+class ContentViewSet(LanguageContextMixin, ConditionalGetMixin, PaginatedListMixin, viewsets.ModelViewSet):
+    """
+    Base viewset for the public, translated content endpoints. ``?ordering=`` picks one
+    of ``ordering_options``; it takes precedence over the orderings filters imply.
+    """
     permission_classes = [permissions.AllowAny]
+    counter_fields = ('trending_score',)
+    ordering_options = {
+        'trending': ('-trending_score', 'id'),
+    }
+    
+    def get_requested_ordering(self):
+        value = self.request.query_params.get('ordering')
+        if not value or self.detail:
+            return None
+        if value not in self.ordering_options:
+            raise ValidationError({"ordering": f"Expected one of: {', '.join(self.ordering_options)}."})
+        return self.ordering_options[value]
+    
+    def get_cursor_ordering(self):
+        return self.get_requested_ordering()
+    
+    def get_sparse_fields(self):
+        """
+        Return ``(fields, expand)`` from ``?fields=a,b`` and ``?expand=category``; ``fields``
+        is None when the full representation was asked for. Unknown names are ignored.
+        """
+        params = self.request.query_params
+        if 'fields' not in params:
+            return None, set()
+        fields = {name.strip() for name in params['fields'].split(',') if name.strip()}
+        expand = {name.strip() for name in params.get('expand', '').split(',') if name.strip()}
+        return fields | {'id'}, expand
+    
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        fields, expand = self.get_sparse_fields()
+        if fields is not None:
+            context['fields'] = fields
+            context['expand'] = expand
+        return context
+    
+    def filter_queryset(self, queryset):
+        """Narrow the selected columns to those the sparse fieldset reads."""
+        queryset = super().filter_queryset(queryset)
+        fields, expand = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        ordering = self.get_cursor_ordering() or OptionalCursorPagination.ordering
+        wanted = fields | {name.lstrip('-') for name in ordering}
+        concrete = {field.name for field in queryset.model._meta.concrete_fields}
+        # Translated and Macedonian variants are stored as <name>_<language> columns
+        columns = [
+            column
+            for name in wanted
+            for column in (name, *(f'{name}_{language}' for language, _name in settings.LANGUAGES))
+            if column in concrete
+        ]
+        queryset = queryset.only(*columns)
+        serializer_class = self.get_serializer_class()
+        for name in fields & expand & set(getattr(serializer_class, 'expandable_fields', ())):
+            queryset = queryset.select_related(name)
+        return queryset
+
+class SaveCountMixin:
+    """
+    For content with a ``save_count``: adds ``?ordering=-saves`` and a ``most-saved``
+    list of the objects saved to the most wishlists.
+    """
+    ordering_options = {
+        **ContentViewSet.ordering_options,
+        '-saves': ('-save_count', 'id'),
+    }
+    counter_fields = (*ContentViewSet.counter_fields, 'save_count')
+    
+    def get_cursor_ordering(self):
+        if self.action == 'most_saved':
+            return self.ordering_options['-saves']
+        return super().get_cursor_ordering()
+    
+    @action(detail=False, methods=['get'], url_path='most-saved')
+    def most_saved(self, request):
+        """Get the objects saved to the most wishlists, most saved first"""
+        most_saved = self.filter_queryset(self.get_queryset()).filter(save_count__gt=0)
+        return self.list_response(most_saved)
+
+class NearbyMixin:
+    """
+    Adds ``?near=lat,lon&radius=km`` to list and featured: rows outside the radius are
+    dropped, the rest come nearest first with a ``distance_km`` field.
+    """
+    
+    def get_near_point(self):
+        near = self.request.query_params.get('near')
+        if not near or self.detail:
+            return None
+        try:
+            return parse_point(near)
+        except ValueError:
+            raise ValidationError({"near": "Expected 'lat,lon' in decimal degrees."})
+    
+    def get_radius(self):
+        try:
+            radius = float(self.request.query_params.get('radius', DEFAULT_RADIUS_KM))
+        except ValueError:
+            radius = math.nan
+        if not math.isfinite(radius):
+            raise ValidationError({"radius": "Expected a distance in km."})
+        return min(max(radius, 0.0), MAX_RADIUS_KM)
+    
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        point = self.get_near_point()
+        if point is None:
+            return queryset
+        return filter_nearby(queryset, *point, self.get_radius())
+    
+    def get_cursor_ordering(self):
+        ordering = super().get_cursor_ordering()
+        if ordering is None and self.get_near_point() is not None:
+            return ('distance_km', 'id')
+        return ordering
     
     def get_serializer_context(self):
         context = super().get_serializer_context()
-        # Get language from user profile or default to 'en'
-        language = 'en'
-        if self.request.user.is_authenticated and hasattr(self.request.user, 'profile'):
-            language = self.request.user.profile.language_preference
-        context['language'] = language
+        if self.get_near_point() is not None:
+            context['annotations'] = ('distance_km',)
         return context
+
+class TagFilterMixin:
+    """
+    Adds ``?tag=`` to list and featured: repeat it or separate tags with commas, and
+    pick ``?tag_mode=any`` (default) or ``all``. Tags match in either language.
+    """
+    
+    def get_tag_slugs(self):
+        if self.detail:
+            return []
+        values = ','.join(self.request.query_params.getlist('tag'))
+        return list(dict.fromkeys(slug for slug in map(tag_slug, values.split(',')) if slug))
+    
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        slugs = self.get_tag_slugs()
+        if not slugs:
+            return queryset
+        mode = self.request.query_params.get('tag_mode', 'any')
+        if mode not in ('any', 'all'):
+            raise ValidationError({"tag_mode": "Expected 'any' or 'all'."})
+        return filter_by_tags(queryset, slugs, match_all=mode == 'all')
+
+class CategoryViewSet(LanguageContextMixin, viewsets.ModelViewSet):
+    queryset = Category.objects.all()
+    serializer_class = CategorySerializer
+    permission_classes = [permissions.AllowAny]
+    counts_cache_timeout = 300
+    
+    @action(detail=False, methods=['get'])
+    def counts(self, request):
+        """
+        Number of listings and events per category, with featured and upcoming
+        breakdowns. Cached until content changes or the next event starts.
+        """
+        cache_key = content_cache_key('category_counts')
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data)
+        
+        now = timezone.now()
+        counts = {
+            category_id: {
+                'listings': {'total': 0, 'featured': 0},
+                'events': {'total': 0, 'featured': 0, 'upcoming': 0},
+            }
+            for category_id in Category.objects.values_list('id', flat=True)
+        }
+        # One grouped query per content type
+        listing_counts = Listing.objects.filter(category__isnull=False).order_by().values('category_id').annotate(
+            total=Count('id'),
+            featured=Count('id', filter=Q(featured=True)),
+        )
+        event_counts = Event.objects.filter(category__isnull=False).order_by().values('category_id').annotate(
+            total=Count('id'),
+            featured=Count('id', filter=Q(featured=True)),
+            upcoming=Count('id', filter=Q(starts_at__gte=now)),
+            next_start=Min('starts_at', filter=Q(starts_at__gt=now)),
+        )
+        for row in listing_counts:
+            counts[row['category_id']]['listings'] = {'total': row['total'], 'featured': row['featured']}
+        next_start = None
+        for row in event_counts:
+            counts[row['category_id']]['events'] = {
+                'total': row['total'], 'featured': row['featured'], 'upcoming': row['upcoming'],
+            }
+            if row['next_start'] and (next_start is None or row['next_start'] < next_start):
+                next_start = row['next_start']
+        
+        data = [{'id': category_id, **category_counts} for category_id, category_counts in counts.items()]
+        cache.set(cache_key, data, timeout_until(next_start, self.counts_cache_timeout, now))
+        return Response(data)
+
+class ListingViewSet(SaveCountMixin, TagFilterMixin, NearbyMixin, ContentViewSet):
+    queryset = Listing.objects.all()
+    serializer_class = ListingSerializer
+    
+    def get_user_flag_state(self):
+        if not self.request.user.is_authenticated:
+            return ''
+        return collection_state(UserPermission.objects.filter(user=self.request.user))
+    
+    def get_open_minute(self):
+        """
+        Minute of the week asked for by ``?open_now=1`` or ``?open_at=`` (an ISO datetime,
+        or HH:MM for today), in the time zone the working hours are entered in.
+        """
+        open_at = self.request.query_params.get('open_at')
+        if self.detail or not (open_at or boolean_param(self.request, 'open_now')):
+            return None
+        zone = local_zone()
+        if not open_at:
+            return minute_of_week(timezone.localtime(timezone=zone))
+        try:
+            moment = parse_datetime(open_at)
+            if moment is None:
+                clock = parse_time(open_at)
+                if clock is None:
+                    raise ValueError(open_at)
+                moment = datetime.combine(timezone.localdate(timezone=zone), clock)
+        except ValueError:
+            raise ValidationError({"open_at": "Expected an ISO datetime or HH:MM."})
+        if timezone.is_aware(moment):
+            moment = moment.astimezone(zone)
+        return minute_of_week(moment)
+    
+    def get_filter_state(self):
+        minute = self.get_open_minute()
+        return '' if minute is None else minute
+    
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        minute = self.get_open_minute()
+        if minute is None:
+            return queryset
+        return queryset.filter(Exists(OpeningInterval.objects.filter(
+            listing=OuterRef('pk'), opens_at__lte=minute, closes_at__gt=minute,
+        )))
     
     @action(detail=False, methods=['get'])
     def featured(self, request):
         """Get only featured listings"""
-        featured_listings = Listing.objects.filter(featured=True)
-        serializer = self.get_serializer(featured_listings, many=True)
-        return Response(serializer.data)
+        featured_listings = self.filter_queryset(self.get_queryset()).filter(featured=True)
+        return self.list_response(featured_listings)
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(SaveCountMixin, NearbyMixin, ContentViewSet):
+    """
+    ``?upcoming=1`` keeps events that haven't started yet and ``?from=&to=`` (ISO
+    datetimes or dates, local time unless an offset is given) keeps events overlapping
+    that window; both list soonest first.
+    """
     queryset = Event.objects.all()
     serializer_class = EventSerializer
-    permission_classes = [permissions.AllowAny]
+    counter_fields = (*SaveCountMixin.counter_fields, 'join_count')
     
-    def get_serializer_context(self):
-        context = super().get_serializer_context()
-        # Get language from user profile or default to 'en'
-        language = 'en'
-        if self.request.user.is_authenticated and hasattr(self.request.user, 'profile'):
-            language = self.request.user.profile.language_preference
-        context['language'] = language
-        return context
+    def get_user_flag_state(self):
+        if not self.request.user.is_authenticated:
+            return ''
+        return collection_state(EventJoin.objects.filter(user=self.request.user), 'created_at')
+    
+    def get_time_param(self, name, end_of_day=False):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            day = parse_date(value)
+            if day is not None:
+                moment = datetime.combine(day + timedelta(days=1) if end_of_day else day, time.min)
+            else:
+                moment = parse_datetime(value)
+                if moment is None:
+                    raise ValueError(value)
+        except ValueError:
+            raise ValidationError({name: "Expected an ISO datetime or date."})
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment, local_zone())
+        return moment
+    
+    def is_time_filtered(self):
+        params = self.request.query_params
+        return not self.detail and (
+            boolean_param(self.request, 'upcoming') or any(params.get(name) for name in ('from', 'to'))
+        )
+    
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not self.is_time_filtered():
+            return queryset
+        if boolean_param(self.request, 'upcoming'):
+            queryset = queryset.filter(starts_at__gte=timezone.now())
+        window_start = self.get_time_param('from')
+        if window_start:
+            queryset = queryset.filter(
+                Q(ends_at__gte=window_start) | Q(ends_at__isnull=True, starts_at__gte=window_start)
+            )
+        window_end = self.get_time_param('to', end_of_day=True)
+        if window_end:
+            queryset = queryset.filter(starts_at__lt=window_end)
+        return queryset
+    
+    def get_cursor_ordering(self):
+        ordering = super().get_cursor_ordering()
+        if ordering is None and self.is_time_filtered():
+            return ('starts_at', 'id')
+        return ordering
     
     @action(detail=False, methods=['get'])
     def featured(self, request):
         """Get only featured events"""
-        featured_events = Event.objects.filter(featured=True)
-        serializer = self.get_serializer(featured_events, many=True)
-        return Response(serializer.data)
+        featured_events = self.filter_queryset(self.get_queryset()).filter(featured=True)
+        return self.list_response(featured_events)
     
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def join(self, request, pk=None):
         """
         Join an event - requires registration.
         Guest users cannot join events and will receive an error with registration prompt.
+        Joining twice is a no-op.
         """
         event = self.get_object()
 
-        # Check if user already joined
-        existing_join = EventJoin.objects.filter(event=event, user=request.user).first()
-        if existing_join:
-            return Response({
-                'error': 'You have already joined this event'
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-        # Create join record
-        EventJoin.objects.create(event=event, user=request.user)
-
-        # Update join count
-        event.join_count = EventJoin.objects.filter(event=event).count()
-        event.save()
+        # The unique (user, event) constraint decides whether this is a new join
+        try:
+            with transaction.atomic():
+                EventJoin.objects.create(event=event, user=request.user)
+        except IntegrityError:
+            message = 'You have already joined this event'
+        else:
+            Event.objects.filter(pk=event.pk).update(join_count=F('join_count') + 1)
+            message = 'Successfully joined the event!'
 
+        event.refresh_from_db(fields=['join_count'])
         serializer = self.get_serializer(event)
+        serializer.context['joined_events'] = {event.id: True}
         return Response({
-            'message': 'Successfully joined the event!',
+            'message': message,
             'event': serializer.data
         }, status=status.HTTP_200_OK)
 
@@ -102,71 +479,268 @@ class EventViewSet(viewsets.ModelViewSet):
     def unjoin(self, request, pk=None):
         """
         Unjoin an event (leave the event) - requires registration.
-        Guest users cannot unjoin events.
+        Guest users cannot unjoin events. Leaving an event that wasn't joined is a no-op.
         """
         event = self.get_object()
 
-        # Check if user has joined
-        existing_join = EventJoin.objects.filter(event=event, user=request.user).first()
-        if not existing_join:
-            return Response({
-                'error': 'You have not joined this event'
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-        # Remove join record
-        existing_join.delete()
-
-        # Update join count
-        event.join_count = EventJoin.objects.filter(event=event).count()
-        event.save()
+        deleted, _ = EventJoin.objects.filter(event=event, user=request.user).delete()
+        if deleted:
+            Event.objects.filter(pk=event.pk, join_count__gt=0).update(join_count=F('join_count') - 1)
+            message = 'Successfully left the event!'
+        else:
+            message = 'You have not joined this event'
 
+        event.refresh_from_db(fields=['join_count'])
         serializer = self.get_serializer(event)
+        serializer.context['joined_events'] = {event.id: False}
         return Response({
-            'message': 'Successfully left the event!',
+            'message': message,
             'event': serializer.data
         }, status=status.HTTP_200_OK)
 
-class PromotionViewSet(viewsets.ModelViewSet):
+class PromotionViewSet(SaveCountMixin, TagFilterMixin, NearbyMixin, ContentViewSet):
+    """
+    Lists only contain promotions that are still valid; ``?include_expired=1`` lists
+    expired ones too. Expired promotions stay reachable by id.
+    """
     queryset = Promotion.objects.all()
     serializer_class = PromotionSerializer
-    permission_classes = [permissions.AllowAny]
     
-    def get_serializer_context(self):
-        context = super().get_serializer_context()
-        # Get language from user profile or default to 'en'
-        language = 'en'
-        if self.request.user.is_authenticated and hasattr(self.request.user, 'profile'):
-            language = self.request.user.profile.language_preference
-        context['language'] = language
-        return context
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.detail or boolean_param(self.request, 'include_expired'):
+            return queryset
+        return queryset.filter(Q(valid_until__isnull=True) | Q(valid_until__gte=local_today()))
     
     @action(detail=False, methods=['get'])
     def featured(self, request):
         """Get only featured promotions"""
-        featured_promotions = Promotion.objects.filter(featured=True)
-        serializer = self.get_serializer(featured_promotions, many=True)
-        return Response(serializer.data)
+        featured_promotions = self.filter_queryset(self.get_queryset()).filter(featured=True)
+        return self.list_response(featured_promotions)
 
-class BlogViewSet(viewsets.ModelViewSet):
+class BlogViewSet(TagFilterMixin, ContentViewSet):
+    """Lists carry a summary with an excerpt; the full content comes from the detail endpoint."""
     queryset = Blog.objects.filter(published=True)
     serializer_class = BlogSerializer
-    permission_classes = [permissions.AllowAny]
     
-    def get_serializer_context(self):
-        context = super().get_serializer_context()
-        # Get language from user profile or default to 'en'
-        language = 'en'
-        if self.request.user.is_authenticated and hasattr(self.request.user, 'profile'):
-            language = self.request.user.profile.language_preference
-        context['language'] = language
-        return context
+    def get_serializer_class(self):
+        if self.detail:
+            return BlogSerializer
+        return BlogSummarySerializer
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not self.detail:
+            queryset = queryset.defer(*BlogSummarySerializer.deferred_fields)
+        return queryset
     
     @action(detail=False, methods=['get'])
     def featured(self, request):
         """Get only featured blogs"""
-        featured_blogs = Blog.objects.filter(featured=True, published=True)
-        serializer = self.get_serializer(featured_blogs, many=True)
-        return Response(serializer.data)
+        featured_blogs = self.filter_queryset(self.get_queryset()).filter(featured=True)
+        return self.list_response(featured_blogs)
+
+class HomeFeedView(APIView):
+    """
+    Everything the home screen needs in one response: featured listings, events,
+    promotions and blogs plus all categories. Categories are loaded once and shared
+    with the listings and events, per-user flags are resolved once per section,
+    and the anonymous variant is cached per language until the next featured
+    event starts or promotion expires.
+    """
+    permission_classes = [permissions.AllowAny]
+    cache_timeout = 300
+    
+    def get(self, request):
+        language = resolve_language(request)
+        cache_key = None
+        if not request.user.is_authenticated:
+            cache_key = content_cache_key('home', language)
+            data = cache.get(cache_key)
+            if data is not None:
+                return Response(data)
+        
+        context = {'request': request, 'language': language}
+        categories = list(Category.objects.all())
+        categories_by_id = {category.id: category for category in categories}
+        
+        now = timezone.now()
+        listings = list(Listing.objects.filter(featured=True))
+        # Started events and expired promotions drop off; undated ones stay
+        events = list(Event.objects.filter(featured=True).exclude(starts_at__lt=now))
+        promotions = list(Promotion.objects.filter(featured=True).exclude(valid_until__lt=local_today()))
+        for item in (*listings, *events):
+            item.category = categories_by_id.get(item.category_id)
+        
+        data = {
+            'listings': ListingSerializer(listings, many=True, context=context).data,
+            'events': EventSerializer(events, many=True, context=context).data,
+            'promotions': PromotionSerializer(promotions, many=True, context=context).data,
+            'blogs': BlogSummarySerializer(
+                Blog.objects.filter(featured=True, published=True).defer(*BlogSummarySerializer.deferred_fields),
+                many=True, context=context,
+            ).data,
+            'categories': CategorySerializer(categories, many=True, context=context).data,
+        }
+        if cache_key:
+            next_change = min((
+                *(event.starts_at for event in events if event.starts_at),
+                *(end_of_day(promotion.valid_until) for promotion in promotions if promotion.valid_until),
+            ), default=None)
+            cache.set(cache_key, data, timeout_until(next_change, self.cache_timeout, now))
+        return Response(data)
+
+class TagCountsView(APIView):
+    """
+    Most used tags with the number of objects carrying them, for tag clouds, in the
+    request's content language. Query parameters: ``type`` (comma separated subset
+    of listing/promotion/blog) and ``limit``.
+    """
+    permission_classes = [permissions.AllowAny]
+    cache_timeout = 300
+    default_limit = 50
+    max_limit = 200
+    
+    def get(self, request):
+        types = [name for name in request.query_params.get('type', '').split(',') if name]
+        invalid = [name for name in types if name not in TAGGED_TYPES]
+        if invalid:
+            return Response(
+                {"error": f"Invalid type: {', '.join(invalid)}. Must be one of: {', '.join(TAGGED_TYPES)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = min(max(int(request.query_params.get('limit', self.default_limit)), 1), self.max_limit)
+        except ValueError:
+            return Response(
+                {"error": "limit must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        language = resolve_language(request)
+        cache_key = content_cache_key('tags', ','.join(sorted(types)), language, limit)
+        data = cache.get(cache_key)
+        if data is None:
+            data = tag_counts(language, types, limit)
+            cache.set(cache_key, data, self.cache_timeout)
+        return Response(data)
+
+class SyncView(APIView):
+    """
+    Changes to the public catalog since ``?since=<token>``: per content type, the rows
+    created or updated since then and the ids deleted since then. Without a token (or
+    with one too old to be answered from the tombstones) the full catalog is returned
+    with ``full: true``. Pass the returned ``token`` on the next sync.
+    """
+    permission_classes = [permissions.AllowAny]
+    
+    def get(self, request):
+        since = request.query_params.get('since')
+        if since:
+            try:
+                since = decode_token(since)
+            except (ValueError, OverflowError, OSError):
+                return Response(
+                    {"error": "Invalid since token."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        context = {'request': request, 'language': resolve_language(request)}
+        token, full, changes = changes_since(since or None, context)
+        return Response({'token': token, 'full': full, **changes})
+
+class SearchView(APIView):
+    """
+    Ranked full-text search across listings, events, promotions and blogs in both languages.
+    Query parameters: ``q`` (required), ``type`` (comma separated subset of
+    listing/event/promotion/blog), ``limit`` and ``offset``.
+    """
+    permission_classes = [permissions.AllowAny]
+    search_types = SEARCH_TYPES
+    default_limit = 20
+    max_limit = 50
+    
+    def find_hits(self, request, query, types, limit, offset):
+        """Return ranked ``(content_type_id, object_id, rank)`` hits."""
+        return search(query, types, limit, offset)
+    
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {"error": "q parameter is required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        types = [name for name in request.query_params.get('type', '').split(',') if name]
+        if any(name not in self.search_types for name in types):
+            return Response(
+                {"error": f"Invalid type. Must be one of: {', '.join(self.search_types)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            limit = min(max(int(request.query_params.get('limit', self.default_limit)), 1), self.max_limit)
+            offset = max(int(request.query_params.get('offset', 0)), 0)
+        except ValueError:
+            return Response(
+                {"error": "limit and offset must be integers"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Fetch one extra hit to know whether another page exists without counting
+        hits = self.find_hits(request, query, types, limit + 1, offset)
+        has_more = len(hits) > limit
+        hits = hits[:limit]
+        
+        context = {'request': request, 'language': resolve_language(request)}
+        return Response({
+            'results': self.serialize_hits(hits, context),
+            'next_offset': offset + limit if has_more else None,
+        })
+    
+    def serialize_hits(self, hits, context):
+        """Load and serialize the hit objects with one query per content type, keeping rank order."""
+        ids_by_type = {}
+        for content_type_id, object_id, _rank in hits:
+            ids_by_type.setdefault(content_type_id, []).append(object_id)
+        
+        items = {}
+        for content_type_id, ids in ids_by_type.items():
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            serializer_class = CARD_SERIALIZERS[model]
+            queryset = model.objects.filter(id__in=ids).defer(*getattr(serializer_class, 'deferred_fields', ()))
+            if model in (Listing, Event):
+                queryset = queryset.select_related('category')
+            data = serializer_class(queryset, many=True, context=context).data
+            items.update({(content_type_id, item['id']): item for item in data})
+        
+        results = []
+        for content_type_id, object_id, rank in hits:
+            item = items.get((content_type_id, object_id))
+            if item is not None:
+                results.append({
+                    'type': ContentType.objects.get_for_id(content_type_id).model,
+                    'rank': rank,
+                    'item': item,
+                })
+        return results
+
+class FuzzySearchView(SearchView):
+    """
+    Typo and script tolerant search over listing, event and promotion titles, tags and
+    addresses ("Gevgelija", "Гевгелија" and "Gevgelia" all match). Accepts the same
+    parameters as SearchView plus ``threshold`` (trigram similarity, 0-1).
+    """
+    search_types = FUZZY_TYPES
+    
+    def find_hits(self, request, query, types, limit, offset):
+        try:
+            threshold = float(request.query_params.get('threshold', DEFAULT_THRESHOLD))
+        except ValueError:
+            threshold = DEFAULT_THRESHOLD
+        threshold = min(max(threshold, 0.05), 1.0)
+        return fuzzy_search(query, types, threshold, limit, offset)
 
 @api_view(["GET"])
 @permission_classes([permissions.AllowAny])
@@ -180,6 +754,7 @@ class Register(APIView):
         s.is_valid(raise_exception=True)
         user = s.save()
         refresh = RefreshToken.for_user(user)
+        refresh[LANGUAGE_CLAIM] = get_user_language(user)
         return Response({
             "user": {"id": user.id, "username": user.username, "email": user.email},
             "access": str(refresh.access_token),
@@ -328,13 +903,24 @@ class GuestLanguageView(APIView):
             'language': language
         })
 
-class WishlistViewSet(viewsets.ModelViewSet):
+class WishlistViewSet(LanguageContextMixin, viewsets.ModelViewSet):
     serializer_class = WishlistSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
         """Return wishlist items for the current user only."""
-        return Wishlist.objects.filter(user=self.request.user)
+        # Load the wishlisted objects with one query per content type instead of
+        # one content_object lookup per row
+        return Wishlist.objects.filter(user=self.request.user).select_related(
+            'content_type'
+        ).prefetch_related(
+            GenericPrefetch('content_object', [
+                Listing.objects.select_related('category'),
+                Event.objects.select_related('category'),
+                Promotion.objects.all(),
+                Blog.objects.defer(*BlogSummarySerializer.deferred_fields),
+            ])
+        )
     
     def create(self, request, *args, **kwargs):
         """Add an item to the user's wishlist."""
@@ -343,9 +929,15 @@ class WishlistViewSet(viewsets.ModelViewSet):
         wishlist_item = serializer.save()
         
         # Return the created wishlist item using the main serializer
-        response_serializer = WishlistSerializer(wishlist_item)
+        response_serializer = self.get_serializer(wishlist_item)
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
     
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            deleted, _ = Wishlist.objects.filter(pk=instance.pk).delete()
+            if deleted:
+                adjust_wishlist_save_counts([(instance.content_type, instance.object_id)], -deleted)
+    
     @action(detail=False, methods=['post'])
     def remove(self, request):
         """Remove an item from wishlist by item_type and item_id."""
@@ -375,56 +967,188 @@ class WishlistViewSet(viewsets.ModelViewSet):
         model_class = model_mapping[item_type]
         content_type = ContentType.objects.get_for_model(model_class)
         
-        try:
-            wishlist_item = Wishlist.objects.get(
+        with transaction.atomic():
+            # Count only what this request deleted; a concurrent remove may have won
+            deleted, _ = Wishlist.objects.filter(
                 user=request.user,
                 content_type=content_type,
                 object_id=item_id
-            )
-            wishlist_item.delete()
-            return Response({"message": "Item removed from wishlist."}, status=status.HTTP_200_OK)
-        except Wishlist.DoesNotExist:
+            ).delete()
+            if deleted:
+                adjust_save_counts(model_class, [item_id], -deleted)
+        if not deleted:
             return Response(
                 {"error": "Item not found in wishlist."},
                 status=status.HTTP_404_NOT_FOUND
             )
+        return Response({"message": "Item removed from wishlist."}, status=status.HTTP_200_OK)
+    
+    item_models = {
+        'listing': Listing,
+        'event': Event,
+        'promotion': Promotion,
+        'blog': Blog,
+    }
+    max_batch_size = 200
+    
+    def parse_item_ref(self, data):
+        """Return ``((item_type, item_id), None)`` or ``(None, error message)`` for an item reference."""
+        item_type = data.get('item_type')
+        item_id = data.get('item_id')
+        if not item_type or not item_id:
+            return None, "Both item_type and item_id are required."
+        if item_type not in self.item_models:
+            return None, "Invalid item_type. Must be 'listing', 'event', 'promotion', or 'blog'."
+        try:
+            # Unlike int(), rejects non-integral values such as 1.7 instead of truncating them
+            return (item_type, IntegerField(min_value=1).run_validation(item_id)), None
+        except ValidationError:
+            return None, "item_id must be a positive integer."
+    
+    def wishlist_state(self, refs):
+        """Return ``{(item_type, item_id): is_wishlisted}`` with one query per content type."""
+        ids_by_type = {}
+        for item_type, item_id in refs:
+            ids_by_type.setdefault(item_type, set()).add(item_id)
+        
+        state = {}
+        for item_type, ids in ids_by_type.items():
+            content_type = ContentType.objects.get_for_model(self.item_models[item_type])
+            wishlisted = set(Wishlist.objects.filter(
+                user=self.request.user,
+                content_type=content_type,
+                object_id__in=ids
+            ).values_list('object_id', flat=True))
+            state.update({(item_type, item_id): item_id in wishlisted for item_id in ids})
+        return state
     
     @action(detail=False, methods=['post'])
     def check(self, request):
         """Check if an item is in the user's wishlist."""
-        item_type = request.data.get('item_type')
-        item_id = request.data.get('item_id')
+        ref, error = self.parse_item_ref(request.data)
+        if error:
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
         
-        if not item_type or not item_id:
+        is_wishlisted = self.wishlist_state([ref])[ref]
+        return Response({"is_wishlisted": is_wishlisted}, status=status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['post'], url_path='check-batch')
+    def check_batch(self, request):
+        """
+        Check many items at once. Expects ``{"items": [{"item_type": ..., "item_id": ...}, ...]}``
+        and returns ``{"wishlisted": {"<item_type>": {"<item_id>": true|false}}}``.
+        """
+        items = request.data.get('items')
+        if not isinstance(items, list) or not items:
             return Response(
-                {"error": "Both item_type and item_id are required."},
+                {"error": "items must be a non-empty list of {item_type, item_id} objects."},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        # Get the content type for the model
-        model_mapping = {
-            'listing': Listing,
-            'event': Event,
-            'promotion': Promotion,
-            'blog': Blog,
-        }
-        
-        if item_type not in model_mapping:
+        if len(items) > self.max_batch_size:
             return Response(
-                {"error": "Invalid item_type. Must be 'listing', 'event', 'promotion', or 'blog'."},
+                {"error": f"At most {self.max_batch_size} items can be checked at once."},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        model_class = model_mapping[item_type]
-        content_type = ContentType.objects.get_for_model(model_class)
+        refs = []
+        for index, item in enumerate(items):
+            ref, error = self.parse_item_ref(item if isinstance(item, dict) else {})
+            if error:
+                return Response({"error": f"items[{index}]: {error}"}, status=status.HTTP_400_BAD_REQUEST)
+            refs.append(ref)
         
-        is_wishlisted = Wishlist.objects.filter(
-            user=request.user,
-            content_type=content_type,
-            object_id=item_id
-        ).exists()
+        wishlisted = {}
+        for (item_type, item_id), is_wishlisted in self.wishlist_state(refs).items():
+            wishlisted.setdefault(item_type, {})[str(item_id)] = is_wishlisted
+        return Response({"wishlisted": wishlisted}, status=status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['post'])
+    def sync(self, request):
+        """
+        Replay wishlist edits made offline. Expects ``{"since": <token>, "operations":
+        [{"op": "add"|"remove", "item_type": ..., "item_id": ...}, ...]}`` with the edits in
+        the order they were made; the last edit per item wins. ``since`` is the ``token``
+        returned by the device's previous sync: a removal never drops an item saved after
+        it (e.g. on another device). Comparing server times keeps device clock skew out
+        of the decision. Everything is applied in one transaction and the response
+        carries the canonical wishlist and the token for the next sync.
+        """
+        serializer = WishlistSyncSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        since = serializer.validated_data.get('since')
+        if since:
+            try:
+                since = decode_token(since)
+            except (ValueError, OverflowError, OSError):
+                return Response(
+                    {"error": "Invalid since token."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        token = encode_token(timezone.now())
         
-        return Response({"is_wishlisted": is_wishlisted}, status=status.HTTP_200_OK)
+        latest = {}
+        for operation in serializer.validated_data['operations']:
+            latest[(operation['item_type'], operation['item_id'])] = operation['op']
+        
+        additions = {ref for ref, op in latest.items() if op == 'add'}
+        removals = {ref for ref, op in latest.items() if op == 'remove'}
+        
+        # Drop additions of objects that don't exist, one query per content type
+        missing = set()
+        for item_type in {item_type for item_type, _ in additions}:
+            ids = {item_id for ref_type, item_id in additions if ref_type == item_type}
+            existing = set(self.item_models[item_type].objects.filter(id__in=ids).values_list('id', flat=True))
+            missing.update((item_type, item_id) for item_id in ids - existing)
+        additions -= missing
+        
+        with transaction.atomic():
+            # Only items not saved yet are inserted; the unique constraint decides which
+            # inserts win against a concurrent save, and only those are counted
+            saved = self.wishlist_state(additions)
+            inserted = []
+            for item_type, item_id in additions:
+                if saved[(item_type, item_id)]:
+                    continue
+                try:
+                    with transaction.atomic():
+                        Wishlist.objects.create(
+                            user=request.user,
+                            content_type=ContentType.objects.get_for_model(self.item_models[item_type]),
+                            object_id=item_id,
+                        )
+                except IntegrityError:
+                    continue
+                inserted.append((item_type, item_id))
+            for item_type, model in self.item_models.items():
+                adjust_save_counts(model, [item_id for ref_type, item_id in inserted if ref_type == item_type], 1)
+            if removals:
+                matches = Q()
+                for item_type, item_id in removals:
+                    matches |= Q(
+                        content_type=ContentType.objects.get_for_model(self.item_models[item_type]),
+                        object_id=item_id,
+                    )
+                removed = Wishlist.objects.filter(matches, user=request.user)
+                if since:
+                    removed = removed.filter(created_at__lte=since)
+                # Locked rows can't be deleted concurrently, so each is counted once
+                locked = list(removed.select_for_update().values_list('pk', 'content_type_id', 'object_id'))
+                if locked:
+                    Wishlist.objects.filter(pk__in=[pk for pk, _, _ in locked]).delete()
+                    adjust_wishlist_save_counts([
+                        (ContentType.objects.get_for_id(content_type_id), object_id)
+                        for _, content_type_id, object_id in locked
+                    ], -1)
+        
+        items = self.get_serializer(self.get_queryset(), many=True)
+        return Response({
+            "token": token,
+            "rejected": [
+                {"item_type": item_type, "item_id": item_id, "error": "Item does not exist."}
+                for item_type, item_id in sorted(missing)
+            ],
+            "items": items.data,
+        }, status=status.HTTP_200_OK)
 
 
 class UserPermissionViewSet(viewsets.ModelViewSet):
@@ -434,7 +1158,9 @@ class UserPermissionViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Return all permissions. In production, add admin check here."""
-        return UserPermission.objects.all()
+        return UserPermission.objects.select_related(
+            'user__profile', 'listing__category', 'granted_by__profile'
+        )
     
     def create(self, request, *args, **kwargs):
         """Create a new user permission."""
@@ -443,7 +1169,7 @@ class UserPermissionViewSet(viewsets.ModelViewSet):
         permission = serializer.save()
         
         # Return the created permission using the main serializer
-        response_serializer = UserPermissionSerializer(permission)
+        response_serializer = self.get_serializer(permission)
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
     
     @action(detail=False, methods=['get'])
@@ -456,7 +1182,7 @@ class UserPermissionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        permissions = UserPermission.objects.filter(user_id=user_id)
+        permissions = self.get_queryset().filter(user_id=user_id)
         serializer = self.get_serializer(permissions, many=True)
         return Response(serializer.data)
     
@@ -470,7 +1196,7 @@ class UserPermissionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        permissions = UserPermission.objects.filter(listing_id=listing_id)
+        permissions = self.get_queryset().filter(listing_id=listing_id)
         serializer = self.get_serializer(permissions, many=True)
         return Response(serializer.data)
 
@@ -529,7 +1255,10 @@ class EditListingView(APIView):
         updated_listing = serializer.save()
         
         # Return the updated listing with full details
-        full_serializer = ListingSerializer(updated_listing, context={'request': request})
+        full_serializer = ListingSerializer(updated_listing, context={
+            'request': request,
+            'language': resolve_language(request),
+        })
         return Response(full_serializer.data)
 
 